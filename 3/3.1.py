@@ -1,25 +1,56 @@
-import requests 
-import json 
-import time 
-import os 
+import requests
+import json
+import time
+import os
+import argparse
+import sys
 
-def getPage(page = 0): 
+from crawl_pipeline import Pipeline, RateLimiter, Stage
+from crawl_state import HighWaterMarks
+from text_cleaning import html_to_text, save_cleaned_text
+
+# Текст фильтра. Отбираем вакансии по слову "Программист"
+SEARCH_TEXT = 'NAME:Программист'
+# Поиск осуществляется по вакансиям в г. Москве
+SEARCH_AREA = 1
+# Ключ запроса в файле отметок инкрементального сбора
+STATE_KEY = '{}|area={}'.format(SEARCH_TEXT, SEARCH_AREA)
+# Кол-во вакансий на 1 странице поиска
+PER_PAGE = 100
+
+# Страницы поиска загружаются через общий интерфейс Fetcher из папки 4
+# (HHParser: keep-alive сессия, адаптивный темп, повторы после 429/5xx)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, '4'))
+from fetchers import RequestsFetcher
+
+search_fetcher = RequestsFetcher(area=SEARCH_AREA)
+
+def getPage(page = 0, date_from = None, by_date = False):
     """
     Создаем метод для получения страницы со списком вакансий.
     Аргументы:
         page - Индекс страницы, начинается с 0. Значение по умолчанию 0,
     т.е. первая страница
+        date_from - Если задано, запрашиваются только вакансии, опубликованные
+    начиная с этого момента (формат published_at из API)
+        by_date - Сортировать выдачу по дате публикации (от новых к старым);
+    с date_from выдача сортируется так всегда
+    Возвращает JSON-ответ как справочник; при ошибке загрузки - исключение
     """
-    
-    # Справочник для параметров GET-запроса
-    params = {
-        'text': 'NAME:Программист',  # Текст фильтра. Отбираем вакансии по слову "Программист"
-        'area': 1,  # Поиск осуществляется по вакансиям в г. Москве
-        'page': page,  # Индекс страницы поиска на hh.ru
-        'per_page': 100  # Кол-во вакансий на 1 странице
-    }
+    data, _ = search_fetcher.fetch_pages([(SEARCH_TEXT, page)], PER_PAGE,
+                                         {SEARCH_TEXT: date_from} if date_from else None,
+                                         'publication_time' if by_date else None)[0]
+    if not data:
+        raise ValueError(f'Не удалось получить страницу поиска {page}')
+    return data
 
-    req = requests.get('https://api.hh.ru/vacancies', params)
+def getVacancy(url):
+    """
+    Получает детальную информацию по вакансии.
+    Аргументы:
+        url - Адрес вакансии в API (поле 'url' из результатов поиска)
+    """
+    req = requests.get(url)
     data = req.content.decode()
     req.close()
     return data
@@ -31,105 +62,353 @@ RESUME_KEYWORDS = [
     'Data Science', "базы данных"
 ]
 
+# Количество страниц поиска для сбора
+PAGES_TO_COLLECT = 4
+
 def contains_resume_keywords(description):
     """Проверяет, содержит ли описание вакансии ключевые слова из резюме"""
     if not description:
         return False
-    
-    import re
-    clean_description = re.sub('<[^<]+?>', ' ', description)
-    clean_description = clean_description.lower()
-    
+
+    clean_description = html_to_text(description).lower()
+
     found_keywords = []
     for keyword in RESUME_KEYWORDS:
         if keyword.lower() in clean_description:
             found_keywords.append(keyword)
-    
+
     if found_keywords:
         print(f"Найдены ключевые слова: {found_keywords}")
         return True
     return False
 
-# Создаем папки для сохранения данных
-if not os.path.isdir("pagination_desc"):
-    os.mkdir("pagination_desc")
+def save_page(page, jsObj):
+    """Сохраняет страницу поиска в папку pagination_desc и возвращает имя файла"""
+    nextFileName = './pagination_desc/page_{}.json'.format(page)
+    with open(nextFileName, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(jsObj, ensure_ascii=False))
+    return nextFileName
+
+def save_vacancy(vacancy_id, data):
+    """
+    Сохраняет исходный JSON вакансии в папку vacancies_desc, а рядом -
+    очищенный от HTML текст описания, чтобы при анализе не разбирать HTML повторно
+    """
+    fileName = './vacancies_desc/{}.json'.format(vacancy_id)
+    with open(fileName, 'w', encoding='utf-8') as f:
+        f.write(data)
+    save_cleaned_text(fileName, json.loads(data).get('description', ''))
+
+def collect_sequential(date_from=None, marks=None):
+    """
+    Исходный двухфазный сбор: сначала все страницы поиска, затем детали вакансий.
+    Отметка учитывает только вакансии, детали которых удалось обработать,
+    и подтверждается, если все страницы поиска получены без ошибок.
+    """
+    # Файлы страниц этого запуска: в папке могут остаться страницы прошлых запусков
+    page_files = []
+    page_failed = False
+
+    # Собираем страницы с вакансиями
+    for page in range(0, PAGES_TO_COLLECT):
+
+        try:
+            # Преобразуем текст ответа запроса в справочник
+            jsObj = getPage(page, date_from, by_date=marks is not None)
+
+            # Сохраняем файлы в папку pagination
+            page_files.append(save_page(page, jsObj))
+
+            print(f'Сохранена страница {page}')
+
+            # Проверка на последнюю страницу
+            if (jsObj['pages'] - page) <= 1:
+                print(f'Достигнута последняя страница. Всего страниц: {jsObj["pages"]}')
+                break
+
+            # Задержка, чтобы не нагружать сервисы hh.ru
+            time.sleep(0.2)
+
+        except Exception as e:
+            print(f"Ошибка при обработке страницы {page}: {e}")
+            page_failed = True
+            break
+
+    print('Страницы поиска собраны. Далее получаем список вакансий...')
+
+    # Счетчики для статистики
+    total_vacancies = 0
+    matched_vacancies = 0
+
+    # Собираем детальную информацию по вакансиям
+    for fl in page_files:
+        # Вакансии страницы, еще не обработанные к моменту ошибки
+        remaining = []
+        try:
+            # Открываем файл, читаем его содержимое
+            with open(fl, encoding='utf-8') as f:
+                jsonText = f.read()
+
+            # Преобразуем полученный текст в объект справочника
+            jsonObj = json.loads(jsonText)
+
+            # Получаем и проходимся по непосредственно списку вакансий
+            remaining = list(jsonObj['items'])
+            for v in jsonObj['items']:
+                total_vacancies += 1
+
+                # Обращаемся к API и получаем детальную информацию по конкретной вакансии
+                data = getVacancy(v['url'])
+
+                # Преобразуем данные вакансии в JSON
+                vacancy_data = json.loads(data)
+
+                # Проверяем, содержит ли описание вакансии ключевые слова из резюме
+                description = vacancy_data.get('description', '')
+
+                if contains_resume_keywords(description):
+                    matched_vacancies += 1
+                    # Сохраняем только те вакансии, которые соответствуют критериям
+                    save_vacancy(v['id'], data)
+                    print(f'Сохранена подходящая вакансия: {v["name"]}')
+
+                if marks is not None:
+                    marks.observe(STATE_KEY, [v])
+                remaining.pop(0)
 
-if not os.path.isdir("vacancies_desc"):
-    os.mkdir("vacancies_desc")
+                time.sleep(0.25)
 
-# Собираем страницы с вакансиями
-for page in range(0, 4):  # Первые 4 страницы
+        except Exception as e:
+            print(f"Ошибка при обработке файла {fl}: {e}")
+            if marks is not None:
+                marks.hold(STATE_KEY, remaining)
+            continue
 
-    try:
-        # Преобразуем текст ответа запроса в справочник
-        jsObj = json.loads(getPage(page))
+    if marks is not None and not page_failed:
+        marks.complete(STATE_KEY)
 
-        # Сохраняем файлы в папку pagination
-        nextFileName = './pagination_desc/page_{}.json'.format(page)
+    return total_vacancies, matched_vacancies
 
-        # Создаем новый документ, записываем в него ответ запроса, после закрываем
-        with open(nextFileName, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(jsObj, ensure_ascii=False))
+def vacancy_stages(detail_workers=4, filter_workers=1, writer_workers=1, queue_size=200, scorer=None, marks=None):
+    """
+    Стадии конвейера после поиска: детали вакансий -> фильтр -> запись.
+    Принимают на вход элементы списка 'items' из страниц поиска.
+    Если передан scorer (online_scoring.OnlineTopK), после получения деталей
+    добавляется стадия оценки каждой вакансии по резюме.
+    Если переданы marks, отметка учитывает вакансию, только когда она записана
+    или отброшена фильтром; вакансии с ошибкой на любой стадии передаются в hold.
+    """
+    # Общий для всех потоков ограничитель частоты запросов к hh.ru
+    detail_limiter = RateLimiter(0.25)
+
+    def fetch_detail(v):
+        detail_limiter.wait()
+        return [(v, getVacancy(v['url']))]
+
+    def score(item):
+        v, data = item
+        vacancy_data = json.loads(data)
+        scorer.score(v['id'], v['name'], html_to_text(vacancy_data.get('description', '')))
+        return [item]
+
+    def keyword_filter(item):
+        v, data = item
+        vacancy_data = json.loads(data)
+        if contains_resume_keywords(vacancy_data.get('description', '')):
+            return [item]
+        if marks is not None:
+            marks.observe(STATE_KEY, [v])
+        return None
+
+    def write(item):
+        v, data = item
+        save_vacancy(v['id'], data)
+        if marks is not None:
+            marks.observe(STATE_KEY, [v])
+        print(f'Сохранена подходящая вакансия: {v["name"]}')
+        return [v['id']]
+
+    def held(func):
+        # Ошибка стадии: вакансия не должна остаться позади новой отметки
+        def run(item):
+            try:
+                return func(item)
+            except Exception:
+                if marks is not None:
+                    marks.hold(STATE_KEY, [item[0] if isinstance(item, tuple) else item])
+                raise
+        return run
+
+    stages = [Stage('detail', held(fetch_detail), workers=detail_workers, queue_size=queue_size)]
+    if scorer is not None:
+        stages.append(Stage('score', held(score), workers=1, queue_size=queue_size))
+    stages += [
+        Stage('filter', held(keyword_filter), workers=filter_workers, queue_size=queue_size),
+        Stage('writer', held(write), workers=writer_workers, queue_size=queue_size),
+    ]
+    return stages
+
+def collect_pipeline(detail_workers=4, queue_size=200, date_from=None, marks=None, scorer=None):
+    """
+    Потоковый сбор: страницы поиска -> детали вакансий -> фильтр -> запись.
+    Все стадии работают одновременно и связаны ограниченными очередями.
+    """
+    page_limiter = RateLimiter(0.2)
+    total_pages = [PAGES_TO_COLLECT]
+    # Успешно полученные страницы поиска
+    fetched_pages = set()
 
+    def fetch_page(page):
+        # Страницы за пределами выдачи не запрашиваем
+        if page >= total_pages[0]:
+            return None
+        page_limiter.wait()
+        jsObj = getPage(page, date_from, by_date=marks is not None)
+        total_pages[0] = min(total_pages[0], jsObj['pages'])
+        save_page(page, jsObj)
+        fetched_pages.add(page)
         print(f'Сохранена страница {page}')
+        return jsObj['items']
+
+    stages = [Stage('search', fetch_page, workers=1, queue_size=queue_size)]
+    stages += vacancy_stages(detail_workers=detail_workers, queue_size=queue_size, scorer=scorer, marks=marks)
+    stats = Pipeline(stages, on_report=scorer.report if scorer else None).run(range(PAGES_TO_COLLECT))
+
+    # Отметка сдвигается, только если все страницы поиска (в пределах PAGES_TO_COLLECT) получены
+    if marks is not None and fetched_pages.issuperset(range(total_pages[0])):
+        marks.complete(STATE_KEY)
+
+    by_stage = {s['stage']: s for s in stats}
+    return by_stage['detail']['processed'], by_stage['writer']['processed']
+
+def snippet_score(v):
+    """
+    Оценка вакансии по сниппету из выдачи поиска: количество ключевых слов резюме,
+    найденных в полях snippet.requirement и snippet.responsibility.
+    """
+    snippet = v.get('snippet') or {}
+    text = ' '.join(filter(None, [snippet.get('requirement'), snippet.get('responsibility')]))
+    # В сниппетах совпадения с запросом обернуты в теги <highlighttext>
+    text = html_to_text(text).lower()
+    return sum(1 for keyword in RESUME_KEYWORDS if keyword.lower() in text)
+
+def collect_prioritized(min_score=0, budget=None, detail_workers=4, queue_size=200, date_from=None, marks=None,
+                        scorer=None):
+    """
+    Двухэтапный сбор: сначала оцениваются сниппеты из страниц поиска,
+    затем детали запрашиваются в порядке убывания оценки.
+    Аргументы:
+        min_score - вакансии с оценкой ниже порога не запрашиваются
+        budget - максимальное количество запросов деталей (None - без ограничения)
+    """
+    candidates = []
+    page_failed = False
+    for page in range(0, PAGES_TO_COLLECT):
+        try:
+            jsObj = getPage(page, date_from, by_date=marks is not None)
+            save_page(page, jsObj)
+            candidates.extend(jsObj['items'])
+            print(f'Сохранена страница {page}')
+
+            if (jsObj['pages'] - page) <= 1:
+                print(f'Достигнута последняя страница. Всего страниц: {jsObj["pages"]}')
+                break
+
+            time.sleep(0.2)
 
-        # Проверка на последнюю страницу
-        if (jsObj['pages'] - page) <= 1:
-            print(f'Достигнута последняя страница. Всего страниц: {jsObj["pages"]}')
+        except Exception as e:
+            print(f"Ошибка при обработке страницы {page}: {e}")
+            page_failed = True
             break
 
-        # Задержка, чтобы не нагружать сервисы hh.ru
-        time.sleep(0.2)
-        
-    except Exception as e:
-        print(f"Ошибка при обработке страницы {page}: {e}")
-        break
-
-print('Страницы поиска собраны. Далее получаем список вакансий...')
-
-# Счетчики для статистики
-total_vacancies = 0
-matched_vacancies = 0
-
-# Собираем детальную информацию по вакансиям
-for fl in os.listdir('./pagination_desc'):
-    try:
-        # Открываем файл, читаем его содержимое
-        with open('./pagination_desc/{}'.format(fl), encoding='utf-8') as f:
-            jsonText = f.read()
-
-        # Преобразуем полученный текст в объект справочника
-        jsonObj = json.loads(jsonText)
-
-        # Получаем и проходимся по непосредственно списку вакансий
-        for v in jsonObj['items']:
-            total_vacancies += 1
-            
-            # Обращаемся к API и получаем детальную информацию по конкретной вакансии
-            req = requests.get(v['url'])
-            data = req.content.decode()
-            req.close()
-
-            # Преобразуем данные вакансии в JSON
-            vacancy_data = json.loads(data)
-            
-            # Проверяем, содержит ли описание вакансии ключевые слова из резюме
-            description = vacancy_data.get('description', '')
-            
-            if contains_resume_keywords(description):
-                matched_vacancies += 1
-                # Сохраняем только те вакансии, которые соответствуют критериям
-                fileName = './vacancies_desc/{}.json'.format(v['id'])
-                with open(fileName, 'w', encoding='utf-8') as f:
-                    f.write(data)
-                print(f'Сохранена подходящая вакансия: {v["name"]}')
-
-            time.sleep(0.25)
-            
-    except Exception as e:
-        print(f"Ошибка при обработке файла {fl}: {e}")
-        continue
-
-print(f'Сбор вакансий завершен!')
-print(f'Всего обработано вакансий: {total_vacancies}')
-print(f'Сохранено подходящих вакансий: {matched_vacancies}')
+    # Сортировка устойчивая: при равной оценке сохраняется порядок выдачи hh.ru
+    scored = sorted(((snippet_score(v), v) for v in candidates), key=lambda sv: sv[0], reverse=True)
+    selected = [v for score, v in scored if score >= min_score]
+    if marks is not None:
+        # Вакансии ниже порога отбрасываются намеренно, а не вошедшие в бюджет - откладываются до следующего запуска
+        marks.observe(STATE_KEY, [v for score, v in scored if score < min_score])
+        if budget is not None:
+            marks.hold(STATE_KEY, selected[budget:])
+    if budget is not None:
+        selected = selected[:budget]
+
+    print(f'Кандидатов в выдаче: {len(candidates)}, будет запрошено деталей: {len(selected)}')
+
+    stages = vacancy_stages(detail_workers=detail_workers, queue_size=queue_size, scorer=scorer, marks=marks)
+    stats = Pipeline(stages, on_report=scorer.report if scorer else None).run(selected)
+
+    if marks is not None and not page_failed:
+        marks.complete(STATE_KEY)
+
+    by_stage = {s['stage']: s for s in stats}
+    return by_stage['detail']['processed'], by_stage['writer']['processed']
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Сбор вакансий hh.ru, подходящих под резюме')
+    arg_parser.add_argument('--mode', choices=['pipeline', 'prioritized', 'sequential'], default='pipeline',
+                            help='pipeline - потоковый конвейер, prioritized - предварительный отбор по сниппетам, '
+                                 'sequential - исходный двухфазный сбор')
+    arg_parser.add_argument('--detail-workers', type=int, default=4,
+                            help='Количество потоков получения деталей вакансий')
+    arg_parser.add_argument('--queue-size', type=int, default=200,
+                            help='Размер очередей между стадиями конвейера')
+    arg_parser.add_argument('--min-score', type=int, default=0,
+                            help='Режим prioritized: минимальная оценка сниппета для запроса деталей')
+    arg_parser.add_argument('--budget', type=int, default=None,
+                            help='Режим prioritized: максимальное количество запросов деталей')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='Собирать только вакансии, опубликованные после предыдущего запуска')
+    arg_parser.add_argument('--resume', default=None,
+                            help='HTML-резюме: оценивать вакансии по нему прямо во время сбора (режимы pipeline и prioritized)')
+    arg_parser.add_argument('--top-k', type=int, default=20,
+                            help='Сколько лучших вакансий хранить при оценке во время сбора')
+    args = arg_parser.parse_args()
+
+    # Создаем папки для сохранения данных
+    if not os.path.isdir("pagination_desc"):
+        os.mkdir("pagination_desc")
+
+    if not os.path.isdir("vacancies_desc"):
+        os.mkdir("vacancies_desc")
+
+    # Инкрементальный режим: новые вакансии дописываются в vacancies_desc
+    # (файлы по id вакансии), отметка сохраняется после завершения сбора
+    marks = None
+    date_from = None
+    if args.incremental:
+        marks = HighWaterMarks()
+        date_from = marks.get(STATE_KEY)
+        if date_from:
+            print(f'Инкрементальный сбор: вакансии, опубликованные с {date_from}')
+
+    # Оценка во время сбора: навыки резюме векторизуются один раз,
+    # зависимости для анализа текста нужны только в этом режиме
+    scorer = None
+    if args.resume:
+        from online_scoring import OnlineTopK
+        from resume_parser import extract_skills_from_resume
+        scorer = OnlineTopK(extract_skills_from_resume(args.resume), k=args.top_k)
+
+    if args.mode == 'pipeline':
+        total_vacancies, matched_vacancies = collect_pipeline(detail_workers=args.detail_workers,
+                                                              queue_size=args.queue_size,
+                                                              date_from=date_from, marks=marks, scorer=scorer)
+    elif args.mode == 'prioritized':
+        total_vacancies, matched_vacancies = collect_prioritized(min_score=args.min_score, budget=args.budget,
+                                                                 detail_workers=args.detail_workers,
+                                                                 queue_size=args.queue_size,
+                                                                 date_from=date_from, marks=marks, scorer=scorer)
+    else:
+        total_vacancies, matched_vacancies = collect_sequential(date_from=date_from, marks=marks)
+
+    if marks is not None:
+        marks.save()
+
+    if scorer is not None:
+        scorer.report(limit=args.top_k)
+        scorer.save()
+        print('Лучшие вакансии сохранены в online_top_vacancies.json')
+
+    print(f'Сбор вакансий завершен!')
+    print(f'Всего обработано вакансий: {total_vacancies}')
+    print(f'Сохранено подходящих вакансий: {matched_vacancies}')
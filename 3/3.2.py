@@ -1,199 +1,237 @@
-import requests 
-import json 
-import time 
 import os 
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from bs4 import BeautifulSoup
+import matplotlib
+# Графики только сохраняются в файл: неинтерактивный backend не требует дисплея
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
+import argparse
 
+from dedup import deduplicate
+from resume_parser import extract_skills_from_resume, ingest_resumes, skills_by_resume
+from similarity_engine import create_engine
+from text_normalization import TextNormalizer
+from vacancy_corpus import load_vacancy_corpus
+from vacancy_index import VacancyIndex
 
-# Функция для извлечения навыков из HTML-резюме
-def extract_skills_from_resume(html_file):
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+
+# Основная функция для анализа сходства
+def analyze_vacancies_similarity(vacancies_folder, resume_skills, workers=None, dedup=False, vectorizer='tfidf',
+                                 normalizer=None):
+    # Создаем текстовые представления навыков
+    soft_skills_text = ' '.join(resume_skills['soft_skills'])
+    hard_skills_text = ' '.join(resume_skills['hard_skills'])
     
-    skills = {'soft_skills': [], 'hard_skills': []}
+    # Загружаем и очищаем все вакансии (большие папки - параллельно по процессам)
+    vacancy_ids, vacancy_names, descriptions = load_vacancy_corpus(vacancies_folder, workers=workers)
     
-    # Функция для разбиения составных навыков
-    def split_composite_skills(skill_text):
-        """Разбивает составные навыки на отдельные элементы"""
-        result = []
-        
-        # Если навык содержит двоеточие, разбиваем его
-        if ':' in skill_text:
-            # Разделяем на категорию и значения
-            category, values = skill_text.split(':', 1)
-            # Разбиваем значения по запятым
-            individual_skills = [v.strip() for v in values.split(',')]
-            result.extend(individual_skills)
-        else:
-            result.append(skill_text)
-        
-        return result
+    # Репосты одной вакансии под разными id оставляем в одном экземпляре
+    if dedup:
+        vacancy_ids, vacancy_names, descriptions = deduplicate(vacancy_ids, vacancy_names, descriptions)
     
-    lines = content.split('\n')
+    if not descriptions:
+        return pd.DataFrame()
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        # Ищем строки таблицы
-        if '<tr class=odd>' in line or '<tr class=even>' in line:
-            # Следующие две строки содержат категорию и значение
-            if i + 2 < len(lines):
-                category_line = lines[i + 1].strip()
-                value_line = lines[i + 2].strip()
-                
-                # Извлекаем текст между тегами td
-                if '<td class=c1>' in category_line and '<td class=c2>' in value_line:
-                    category = category_line.replace('<td class=c1>', '').replace('</td>', '').strip()
-                    value = value_line.replace('<td class=c2>', '').replace('</td>', '').strip()
-                    
-                    # Обрабатываем многострочные значения
-                    if not value and i + 3 < len(lines):
-                        next_line = lines[i + 3].strip()
-                        if not next_line.startswith('<tr') and not next_line.startswith('</tr'):
-                            value = next_line.replace('<br>', ' ').strip()
-                    
-                    # Soft Skills
-                    if category == 'Личные качества' and value:
-                        skills['soft_skills'].extend([skill.strip() for skill in value.split(',')])
-                    
-                    elif category == 'Увлечения' and value:
-                        # Обрабатываем увлечения
-                        hobbies = value.replace('<br>', ';').split(';')
-                        for hobby in hobbies:
-                            hobby = hobby.strip()
-                            if hobby and ':' not in hobby:  # Простые увлечения
-                                skills['soft_skills'].append(hobby)
-                            elif ':' in hobby:  # Сложные структуры (Игры: ...)
-                                hobby_type, hobby_list = hobby.split(':', 1)
-                                skills['soft_skills'].append(hobby_type.strip())
-                                # Разбиваем список игр/книг
-                                sub_hobbies = [h.strip() for h in hobby_list.split(',')]
-                                skills['soft_skills'].extend(sub_hobbies)
-                    
-                    elif category == 'Личные достижения' and value:
-                        skills['soft_skills'].append(value)
-                    
-                    # Hard Skills
-                    elif category == 'Владение языками' and value:
-                        languages = value.split(';')
-                        for lang in languages:
-                            lang = lang.strip()
-                            if '-' in lang:
-                                lang_name, level = lang.split('-', 1)
-                                skills['hard_skills'].append(f"{lang_name.strip()} ({level.strip()})")
-                            else:
-                                skills['hard_skills'].append(lang)
-                    
-                    elif category == 'Профессиональная специализация и владение компьютером' and value:
-                        # Обрабатываем профессиональные навыки
-                        lines_to_process = []
-                        j = i + 2
-                        while j < len(lines) and ('<td class=c2>' in lines[j] or '<br>' in lines[j] or 
-                                                (lines[j].strip() and not lines[j].strip().startswith('<tr'))):
-                            line_content = lines[j].strip()
-                            if '<td class=c2>' in line_content:
-                                line_content = line_content.replace('<td class=c2>', '').replace('</td>', '')
-                            if line_content and not line_content.startswith('<tr'):
-                                lines_to_process.append(line_content)
-                            j += 1
-                        
-                        full_text = ' '.join(lines_to_process)
-                        # Разбиваем по номерам пунктов
-                        sections = full_text.split('<br>')
-                        for section in sections:
-                            section = section.strip()
-                            if section and not section.isspace():
-                                if '.' in section and section[0].isdigit():
-                                    section = section.split('.', 1)[1].strip()
-                                
-                                # Разбиваем составные навыки
-                                individual_skills = split_composite_skills(section)
-                                skills['hard_skills'].extend(individual_skills)
+    # Векторайзер обучается один раз на всем корпусе, сходство со всеми
+    # вакансиями считается одним матрично-векторным произведением
+    engine = create_engine(vectorizer, normalizer=normalizer)
+    try:
+        engine.fit(descriptions, extra_documents=[soft_skills_text, hard_skills_text])
+        soft_similarity = engine.score(soft_skills_text)
+        hard_similarity = engine.score(hard_skills_text)
+    except ValueError as e:
+        # Пустой словарь (напр., все слова оказались стоп-словами)
+        print(f"Ошибка при построении TF-IDF: {e}")
+        soft_similarity = np.zeros(len(descriptions))
+        hard_similarity = np.zeros(len(descriptions))
     
-    # Очистка и фильтрация навыков
-    skills['soft_skills'] = [skill for skill in skills['soft_skills'] if skill and len(skill) > 1 and skill != 'br']
-    skills['hard_skills'] = [skill for skill in skills['hard_skills'] if skill and len(skill) > 1 and skill != 'br']
+    return pd.DataFrame({
+        'vacancy_id': vacancy_ids,
+        'vacancy_name': vacancy_names,
+        'soft_similarity': soft_similarity,
+        'hard_similarity': hard_similarity,
+        'overall_similarity': (soft_similarity + hard_similarity) / 2,
+        'description_length': [len(description) for description in descriptions]
+    })
+
+# Пакетный режим: много резюме против всего корпуса вакансий
+def analyze_resumes_batch(resumes_folder, vacancies_folder, top_k=10, block_size=128, workers=None, dedup=False,
+                          vectorizer='tfidf', normalizer=None):
+    """
+    Сопоставляет все резюме из папки (HTML-выгрузки) со всеми вакансиями
+    и возвращает top_k вакансий для каждого резюме.
+    """
+    # Резюме разбираются пулом процессов в компактную таблицу навыков
+    resumes = skills_by_resume(ingest_resumes(resumes_folder, workers=workers))
+    resume_names = list(resumes)
+    soft_texts = [' '.join(resumes[name]['soft_skills']) for name in resume_names]
+    hard_texts = [' '.join(resumes[name]['hard_skills']) for name in resume_names]
     
-    # Убираем дубликаты
-    skills['soft_skills'] = list(set(skills['soft_skills']))
-    skills['hard_skills'] = list(set(skills['hard_skills']))
+    vacancy_ids, vacancy_names, descriptions = load_vacancy_corpus(vacancies_folder, workers=workers)
+    if dedup:
+        vacancy_ids, vacancy_names, descriptions = deduplicate(vacancy_ids, vacancy_names, descriptions)
     
-    # Дополнительная очистка для hard skills (убираем пустые и слишком короткие)
-    skills['hard_skills'] = [skill for skill in skills['hard_skills'] if skill and len(skill) > 2]
+    if not descriptions or not resume_names:
+        return pd.DataFrame()
     
-    return skills
-
-# Функция для расчета семантического сходства
-def calculate_semantic_similarity(text1, text2):
-    if not text1 or not text2:
-        return 0.0
+    # Словарь и IDF строятся один раз по вакансиям и навыкам всех резюме
+    engine = create_engine(vectorizer, normalizer=normalizer)
+    try:
+        engine.fit(descriptions, extra_documents=soft_texts + hard_texts)
+    except ValueError as e:
+        # Пустой словарь (напр., все слова оказались стоп-словами)
+        print(f"Ошибка при построении TF-IDF: {e}")
+        return pd.DataFrame()
     
-    # Создаем TF-IDF векторайзер
-    vectorizer = TfidfVectorizer(stop_words='english', min_df=1)
+    results = []
+    for resume_row, order, soft, hard in engine.top_k_batch(soft_texts, hard_texts, k=top_k,
+                                                            block_size=block_size):
+        for rank, (vacancy_index, soft_similarity, hard_similarity) in enumerate(zip(order, soft, hard), 1):
+            results.append({
+                'resume': resume_names[resume_row],
+                'rank': rank,
+                'vacancy_id': vacancy_ids[vacancy_index],
+                'vacancy_name': vacancy_names[vacancy_index],
+                'soft_similarity': soft_similarity,
+                'hard_similarity': hard_similarity,
+                'overall_similarity': (soft_similarity + hard_similarity) / 2
+            })
     
-    try:
-        # Преобразуем тексты в TF-IDF векторы
-        tfidf_matrix = vectorizer.fit_transform([text1, text2])
-        
-        # Вычисляем косинусное сходство
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        return similarity*100
-    except:
-        return 0.0
+    return pd.DataFrame(results)
 
-# Основная функция для анализа сходства
-def analyze_vacancies_similarity(vacancies_folder, resume_skills):
-    results = []
+# Пакетный режим с приближенным поиском по сохраненному индексу вакансий
+def analyze_resumes_with_index(resumes_folder, index_dir, top_k=10, nprobe=4, workers=None):
+    """
+    То же, что analyze_resumes_batch, но по индексу vacancy_index.py: для каждого
+    резюме точно оцениваются только кандидаты из nprobe списков IVF.
+    IVF строится при первом запуске и сохраняется рядом с файлами индекса.
+    """
+    index = VacancyIndex(index_dir)
+    if index.ann is None:
+        print("IVF для индекса не найден, построение...")
+        index.build_ann()
     
-    # Создаем текстовые представления навыков
-    soft_skills_text = ' '.join(resume_skills['soft_skills'])
-    hard_skills_text = ' '.join(resume_skills['hard_skills'])
+    resumes = skills_by_resume(ingest_resumes(resumes_folder, workers=workers))
     
-    # Обрабатываем каждую вакансию
-    for vacancy_file in os.listdir(vacancies_folder):
-        if vacancy_file.endswith('.json'):
-            try:
-                with open(os.path.join(vacancies_folder, vacancy_file), 'r', encoding='utf-8') as f:
-                    vacancy_data = json.load(f)
-                
-                vacancy_description = vacancy_data.get('description', '')
-                vacancy_name = vacancy_data.get('name', '')
-                vacancy_id = vacancy_data.get('id', '')
-                
-                if vacancy_description:
-                    # Очищаем описание от HTML тегов
-                    soup = BeautifulSoup(vacancy_description, 'html.parser')
-                    clean_description = soup.get_text()
-                    
-                    # Вычисляем сходство
-                    soft_similarity = calculate_semantic_similarity(clean_description, soft_skills_text)
-                    hard_similarity = calculate_semantic_similarity(clean_description, hard_skills_text)
-                    overall_similarity = (soft_similarity + hard_similarity) / 2
-                    
-                    results.append({
-                        'vacancy_id': vacancy_id,
-                        'vacancy_name': vacancy_name,
-                        'soft_similarity': soft_similarity,
-                        'hard_similarity': hard_similarity,
-                        'overall_similarity': overall_similarity,
-                        'description_length': len(clean_description)
-                    })
-                    
-            except Exception as e:
-                print(f"Ошибка при обработке вакансии {vacancy_file}: {e}")
-                continue
+    results = []
+    for resume_name, skills in resumes.items():
+        soft = index.scores(' '.join(skills['soft_skills']), nprobe)
+        hard = index.scores(' '.join(skills['hard_skills']), nprobe)
+        overall = (soft + hard) / 2
+        k = min(top_k, len(overall))
+        if k <= 0:
+            continue
+        top = np.argpartition(-overall, k - 1)[:k]
+        top = top[np.argsort(-overall[top])]
+        for rank, vacancy_index in enumerate(top, 1):
+            results.append({
+                'resume': resume_name,
+                'rank': rank,
+                'vacancy_id': index.ids[vacancy_index],
+                'vacancy_name': index.names[vacancy_index],
+                'soft_similarity': soft[vacancy_index],
+                'hard_similarity': hard[vacancy_index],
+                'overall_similarity': overall[vacancy_index]
+            })
     
     return pd.DataFrame(results)
 
+# Начиная с этого количества вакансий графики строятся по агрегатам, а не по точкам
+AGGREGATE_PLOT_THRESHOLD = 50000
+
+
+def _box_stats(values, label, max_fliers, rng):
+    """Статистика boxplot по квантилям с выборкой выбросов (для Axes.bxp)."""
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    if len(fliers) > max_fliers:
+        fliers = rng.choice(fliers, max_fliers, replace=False)
+    return {'label': label, 'q1': q1, 'med': median, 'q3': q3,
+            'whislo': inside.min() if len(inside) else q1, 'whishi': inside.max() if len(inside) else q3,
+            'fliers': fliers}
+
+
+def visualize_results_aggregated(df, gridsize=60, max_outliers=500, filename='semantic_similarity_analysis.png'):
+    """
+    Те же шесть графиков, что и visualize_results, но по агрегатам: гистограммы
+    считаются заранее, облака точек заменены hexbin-сетками, а выбросы
+    рисуются выборкой не более max_outliers точек. Время отрисовки не зависит
+    от количества вакансий.
+    """
+    rng = np.random.default_rng(0)
+    soft = df['soft_similarity'].to_numpy()
+    hard = df['hard_similarity'].to_numpy()
+    overall = df['overall_similarity'].to_numpy()
+    lengths = df['description_length'].to_numpy()
+
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+
+    # 1. Распределение сходства по заранее посчитанным гистограммам
+    bins = np.linspace(0, max(soft.max(), hard.max(), 1e-9), 21)
+    for values, label in ((soft, 'Soft Skills'), (hard, 'Hard Skills')):
+        counts, _ = np.histogram(values, bins=bins)
+        axes[0, 0].stairs(counts, bins, fill=True, alpha=0.7, label=label)
+    axes[0, 0].set_title('Распределение семантического сходства')
+    axes[0, 0].set_xlabel('Сходство')
+    axes[0, 0].set_ylabel('Количество вакансий')
+    axes[0, 0].legend()
+
+    # 2. Сравнение soft vs hard skills: плотность на шестиугольной сетке
+    hexbin = axes[0, 1].hexbin(soft, hard, gridsize=gridsize, bins='log', mincnt=1, cmap='viridis')
+    fig.colorbar(hexbin, ax=axes[0, 1], label='Количество вакансий')
+    axes[0, 1].set_title('Soft Skills vs Hard Skills сходство')
+    axes[0, 1].set_xlabel('Soft Skills сходство')
+    axes[0, 1].set_ylabel('Hard Skills сходство')
+
+    # 3. Топ вакансий по общему сходству
+    top_vacancies = df.nlargest(10, 'overall_similarity')
+    axes[0, 2].barh(range(len(top_vacancies)), top_vacancies['overall_similarity'])
+    axes[0, 2].set_yticks(range(len(top_vacancies)))
+    axes[0, 2].set_yticklabels([name[:30] + '...' for name in top_vacancies['vacancy_name']], fontsize=8)
+    axes[0, 2].set_title('Топ-10 вакансий по сходству')
+
+    # 4. Зависимость сходства от длины описания: плотность и выборка самых похожих вакансий
+    hexbin = axes[1, 0].hexbin(lengths, overall, gridsize=gridsize, bins='log', mincnt=1, cmap='viridis')
+    fig.colorbar(hexbin, ax=axes[1, 0], label='Количество вакансий')
+    outliers = np.flatnonzero(overall > np.percentile(overall, 99))
+    if len(outliers) > max_outliers:
+        outliers = rng.choice(outliers, max_outliers, replace=False)
+    axes[1, 0].scatter(lengths[outliers], overall[outliers], s=6, color='red', label='Топ-1% (выборка)')
+    axes[1, 0].legend()
+    axes[1, 0].set_title('Зависимость сходства от длины описания')
+    axes[1, 0].set_xlabel('Длина описания')
+    axes[1, 0].set_ylabel('Общее сходство')
+
+    # 5. Boxplot по квантилям с выборкой выбросов
+    axes[1, 1].bxp([_box_stats(soft, 'Soft Skills', max_outliers, rng),
+                    _box_stats(hard, 'Hard Skills', max_outliers, rng)])
+    axes[1, 1].set_title('Распределение сходства по типам навыков')
+
+    # 6. Heatmap корреляции
+    corr_matrix = df[['soft_similarity', 'hard_similarity', 'overall_similarity', 'description_length']].corr()
+    sns.heatmap(corr_matrix, annot=True, ax=axes[1, 2], cmap='coolwarm')
+    axes[1, 2].set_title('Матрица корреляции')
+
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
 # Функция для визуализации результатов
-def visualize_results(df, resume_skills):
+def visualize_results(df, resume_skills, mode='auto'):
+    """
+    Строит графики сходства и сохраняет их в semantic_similarity_analysis.png.
+    mode: 'raw' - по всем точкам, 'aggregated' - по агрегатам
+    (visualize_results_aggregated), 'auto' - агрегаты для больших выборок.
+    """
+    if mode == 'aggregated' or (mode == 'auto' and len(df) >= AGGREGATE_PLOT_THRESHOLD):
+        visualize_results_aggregated(df)
+        print_similarity_statistics(df, resume_skills)
+        return
+
     # Создаем графики
     fig, axes = plt.subplots(2, 3, figsize=(18, 12))
     
@@ -236,8 +274,12 @@ def visualize_results(df, resume_skills):
     
     plt.tight_layout()
     plt.savefig('semantic_similarity_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
-    
+    plt.close(fig)
+
+    print_similarity_statistics(df, resume_skills)
+
+
+def print_similarity_statistics(df, resume_skills):
     print("\n=== СТАТИСТИКА АНАЛИЗА СЕМАНТИЧЕСКОГО СХОДСТВА ===")
     print(f"Всего проанализировано вакансий: {len(df)}")
     print(f"\nSoft Skills из резюме: {resume_skills['soft_skills']}")
@@ -249,30 +291,69 @@ def visualize_results(df, resume_skills):
 
 
 if __name__ == "__main__":
-    # Извлекаем навыки из резюме
-    print("Извлечение навыков из резюме...")
-    resume_skills = extract_skills_from_resume('index.htm')
+    arg_parser = argparse.ArgumentParser(description='Семантическое сходство резюме и вакансий')
+    arg_parser.add_argument('--resumes-dir', default=None,
+                            help='Пакетный режим: папка с HTML-резюме, для каждого выводится топ-k вакансий')
+    arg_parser.add_argument('-k', type=int, default=10, help='Пакетный режим: количество вакансий на резюме')
+    arg_parser.add_argument('--dedup', action='store_true',
+                            help='Удалить почти одинаковые вакансии (MinHash/LSH) перед расчетом сходства')
+    arg_parser.add_argument('--vectorizer', choices=['tfidf', 'hashing'], default='tfidf',
+                            help='tfidf - обучаемый словарь, hashing - хеширование n-грамм с онлайн-IDF')
+    arg_parser.add_argument('--normalize', action='store_true',
+                            help='Леммы и русские/английские стоп-слова с кэшем нормализованных текстов на диске')
+    arg_parser.add_argument('--plot', choices=['auto', 'raw', 'aggregated'], default='auto',
+                            help='raw - все точки, aggregated - hexbin и гистограммы (для больших выборок)')
+    arg_parser.add_argument('--ann', action='store_true',
+                            help='Пакетный режим: приближенный поиск (IVF) по индексу vacancy_index.py')
+    arg_parser.add_argument('--index', default='vacancy_index', help='Папка индекса для --ann')
+    arg_parser.add_argument('--nprobe', type=int, default=4, help='--ann: количество просматриваемых списков IVF')
+    args = arg_parser.parse_args()
     
-    print("Soft Skills:", resume_skills['soft_skills'])
-    print("Hard Skills:", resume_skills['hard_skills'])
+    # Кэш нормализованных документов переживает запуски: неизменившиеся тексты не токенизируются заново
+    normalizer = TextNormalizer(cache_path='normalized_cache.sqlite') if args.normalize else None
     
-    # Анализируем сходство вакансий
-    if os.path.isdir('vacancies_desc'):
-        print("\nАнализ семантического сходства...")
-        results_df = analyze_vacancies_similarity('vacancies_desc', resume_skills)
+    if args.resumes_dir:
+        print("Пакетное сопоставление резюме и вакансий...")
+        if args.ann:
+            batch_df = analyze_resumes_with_index(args.resumes_dir, args.index, top_k=args.k, nprobe=args.nprobe)
+        else:
+            batch_df = analyze_resumes_batch(args.resumes_dir, 'vacancies_desc', top_k=args.k, dedup=args.dedup,
+                                             vectorizer=args.vectorizer, normalizer=normalizer)
+        if not batch_df.empty:
+            batch_df.to_excel('batch_top_vacancies.xlsx', index=False)
+            print(f"Резюме обработано: {batch_df['resume'].nunique()}")
+            print("Результаты сохранены в файл batch_top_vacancies.xlsx")
+        else:
+            print("Нет данных для анализа. Проверьте папки с резюме и вакансиями.")
+    else:
+        # Извлекаем навыки из резюме
+        print("Извлечение навыков из резюме...")
+        resume_skills = extract_skills_from_resume('index.htm')
+    
+        print("Soft Skills:", resume_skills['soft_skills'])
+        print("Hard Skills:", resume_skills['hard_skills'])
+    
+        # Анализируем сходство вакансий
+        if os.path.isdir('vacancies_desc'):
+            print("\nАнализ семантического сходства...")
+            results_df = analyze_vacancies_similarity('vacancies_desc', resume_skills, dedup=args.dedup,
+                                                      vectorizer=args.vectorizer, normalizer=normalizer)
         
-        if not results_df.empty:
-            results_df.to_excel('semantic_similarity_results.xlsx', index=False)
-            results_df = results_df.sort_values('overall_similarity', ascending=False)
-            top_results = results_df.head(20)
-            top_results.to_excel('top_similar_vacancies.xlsx', index=False)
-            visualize_results(results_df, resume_skills)
+            if not results_df.empty:
+                results_df.to_excel('semantic_similarity_results.xlsx', index=False)
+                results_df = results_df.sort_values('overall_similarity', ascending=False)
+                top_results = results_df.head(20)
+                top_results.to_excel('top_similar_vacancies.xlsx', index=False)
+                visualize_results(results_df, resume_skills, mode=args.plot)
             
-            print(f"\nРезультаты сохранены в файлы:")
-            print("- semantic_similarity_results.xlsx (все вакансии)")
-            print("- top_similar_vacancies.xlsx (топ-20 вакансий)")
-            print("- semantic_similarity_analysis.png (графики)")
+                print(f"\nРезультаты сохранены в файлы:")
+                print("- semantic_similarity_results.xlsx (все вакансии)")
+                print("- top_similar_vacancies.xlsx (топ-20 вакансий)")
+                print("- semantic_similarity_analysis.png (графики)")
+            else:
+                print("Нет данных для анализа. Убедитесь, что вакансии были собраны.")
         else:
-            print("Нет данных для анализа. Убедитесь, что вакансии были собраны.")
-    else:
-        print("Папка 'vacancies' не найдена. Сначала выполните сбор вакансий.")
+            print("Папка 'vacancies' не найдена. Сначала выполните сбор вакансий.")
+    
+    if normalizer is not None:
+        normalizer.close()
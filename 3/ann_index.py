@@ -0,0 +1,208 @@
+import argparse
+import os
+import random
+import shutil
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+from similarity_engine import TfidfSimilarityEngine
+from vacancy_corpus import load_vacancy_corpus
+
+
+class IVFIndex:
+    """
+    Приближенный поиск ближайших вакансий (IVF) по матрице TF-IDF.
+
+    Векторы TF-IDF сжимаются TruncatedSVD до n_components измерений и
+    разбиваются k-means на nlist списков. Запрос сравнивается только с
+    центроидами, вакансии из nprobe ближайших списков становятся кандидатами
+    и переранжируются точным косинусом по полным векторам TF-IDF.
+
+    Списки хранят сами векторы (строки матрицы в порядке списков), поэтому
+    кандидаты списка - непрерывный срез, и переранжирование читает только
+    зондируемые списки, в том числе из файлов через memory-map (save/load).
+
+    Полнота и задержка настраиваются параметрами nlist (при построении)
+    и nprobe (при запросе): больше nprobe - выше полнота и больше кандидатов.
+    """
+
+    FILE = 'ivf.npz'
+    DATA_FILE = 'ivf_data.npy'
+    INDICES_FILE = 'ivf_indices.npy'
+    INDPTR_FILE = 'ivf_indptr.npy'
+
+    def __init__(self, components: np.ndarray, centroids: np.ndarray, members: np.ndarray,
+                 offsets: np.ndarray, vectors: sp.csr_matrix):
+        self.components = components
+        self.centroids = centroids
+        self.members = members
+        self.offsets = offsets
+        self.vectors = vectors
+
+    @classmethod
+    def fit(cls, matrix: sp.csr_matrix, n_components: int = 128, nlist: Optional[int] = None,
+            seed: int = 0) -> 'IVFIndex':
+        """Строит IVF по нормированной матрице TF-IDF (строка - вакансия)."""
+        matrix = sp.csr_matrix(matrix)
+        n_docs = matrix.shape[0]
+
+        n_components = max(1, min(n_components, matrix.shape[1] - 1, n_docs - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=seed)
+        reduced = normalize(svd.fit_transform(matrix))
+
+        nlist = nlist or max(1, int(np.sqrt(n_docs)))
+        nlist = min(nlist, n_docs)
+        kmeans = MiniBatchKMeans(n_clusters=nlist, random_state=seed, n_init=3).fit(reduced)
+
+        # Списки хранятся одним массивом id, отсортированным по номеру кластера
+        labels = kmeans.labels_
+        members = np.argsort(labels, kind='stable')
+        offsets = np.searchsorted(labels[members], np.arange(nlist + 1))
+        return cls(svd.components_, normalize(kmeans.cluster_centers_), members, offsets, matrix[members])
+
+    @classmethod
+    def from_engine(cls, engine: TfidfSimilarityEngine, **kwargs) -> 'IVFIndex':
+        """IVF по матрице обученного TfidfSimilarityEngine."""
+        return cls.fit(engine.matrix, **kwargs)
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[0]
+
+    def probe(self, query, nprobe: int = 4) -> np.ndarray:
+        """Номера nprobe списков, ближайших к запросу (разреженный TF-IDF вектор)."""
+        reduced = normalize(np.asarray(query @ self.components.T))
+        centroid_sims = (self.centroids @ reduced.T).ravel()
+        nprobe = min(nprobe, self.nlist)
+        return np.argpartition(-centroid_sims, nprobe - 1)[:nprobe]
+
+    def candidates(self, query, nprobe: int = 4) -> np.ndarray:
+        """Индексы вакансий из nprobe списков, ближайших к запросу."""
+        return np.concatenate([self.members[self.offsets[c]:self.offsets[c + 1]] for c in self.probe(query, nprobe)])
+
+    def rerank(self, query, nprobe: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Кандидаты из nprobe списков и их точный косинус с запросом.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: индексы вакансий и косинусное сходство (0..1).
+        """
+        lists = self.probe(query, nprobe)
+        docs = np.concatenate([self.members[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+        rows = sp.vstack([self.vectors[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+        return docs, (rows @ query.T).toarray().ravel()
+
+    def search(self, query, k: int = 10, nprobe: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Топ-k вакансий для запроса (TF-IDF вектор): кандидаты из IVF, точное переранжирование.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: индексы вакансий и сходство в процентах по убыванию.
+        """
+        candidates, exact = self.rerank(query, nprobe)
+        exact = exact * 100
+
+        k = min(k, len(candidates))
+        if k <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        top = np.argpartition(-exact, k - 1)[:k]
+        top = top[np.argsort(-exact[top])]
+        return candidates[top], exact[top]
+
+    def save(self, directory: str):
+        """
+        Сохраняет IVF в новую папку directory (она не должна существовать):
+        файлы пишутся во временную папку, которая затем переименовывается.
+        """
+        tmp_dir = directory + '.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        np.savez(os.path.join(tmp_dir, self.FILE), components=self.components, centroids=self.centroids,
+                 members=self.members, offsets=self.offsets, shape=np.array(self.vectors.shape))
+        np.save(os.path.join(tmp_dir, self.DATA_FILE), self.vectors.data)
+        np.save(os.path.join(tmp_dir, self.INDICES_FILE), self.vectors.indices)
+        np.save(os.path.join(tmp_dir, self.INDPTR_FILE), self.vectors.indptr)
+        os.replace(tmp_dir, directory)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'IVFIndex':
+        """Загружает IVF; векторы списков читаются через memory-map."""
+        mmap_mode = 'r' if mmap else None
+        with np.load(os.path.join(directory, cls.FILE)) as f:
+            arrays = {name: f[name] for name in f.files}
+        vectors = sp.csr_matrix((np.load(os.path.join(directory, cls.DATA_FILE), mmap_mode=mmap_mode),
+                                 np.load(os.path.join(directory, cls.INDICES_FILE), mmap_mode=mmap_mode),
+                                 np.load(os.path.join(directory, cls.INDPTR_FILE), mmap_mode=mmap_mode)),
+                                shape=tuple(arrays['shape']), copy=False)
+        return cls(arrays['components'], arrays['centroids'], arrays['members'], arrays['offsets'], vectors)
+
+
+def exact_top_k(engine: TfidfSimilarityEngine, text: str, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """Точный топ-k по всему корпусу (для сравнения с IVFIndex)."""
+    scores = engine.score(text)
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+def benchmark_recall(engine: TfidfSimilarityEngine, index: IVFIndex, queries: List[str], k: int = 10,
+                     nprobes: Iterable[int] = (1, 2, 4, 8, 16)) -> List[dict]:
+    """
+    Полнота recall@k и задержка IVFIndex относительно точного поиска.
+
+    Учитываются только вакансии точного топ-k с ненулевым сходством,
+    запросы без таких вакансий пропускаются.
+    """
+    exact_results = []
+    start = time.perf_counter()
+    for query in queries:
+        top, scores = exact_top_k(engine, query, k)
+        exact_results.append(set(top[scores > 0].tolist()))
+    exact_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+    print(f"Точный поиск: {exact_ms:.2f} мс на запрос")
+
+    report = []
+    for nprobe in nprobes:
+        recalls = []
+        start = time.perf_counter()
+        for query, relevant in zip(queries, exact_results):
+            found, _ = index.search(engine.transform([query]), k, nprobe)
+            if relevant:
+                recalls.append(len(relevant & set(found.tolist())) / len(relevant))
+        ann_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+        recall = float(np.mean(recalls)) if recalls else 0.0
+        report.append({'nprobe': nprobe, 'recall_at_k': recall, 'ann_ms': ann_ms, 'exact_ms': exact_ms})
+        print(f"nprobe={nprobe:3d}: recall@{k} = {recall:.3f}, {ann_ms:.2f} мс на запрос")
+    return report
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Бенчмарк приближенного поиска вакансий (IVF)')
+    arg_parser.add_argument('--vacancies', default='vacancies_desc', help='Папка с JSON вакансий')
+    arg_parser.add_argument('--nlist', type=int, default=None, help='Количество списков IVF (по умолчанию sqrt(N))')
+    arg_parser.add_argument('--components', type=int, default=128, help='Размерность после TruncatedSVD')
+    arg_parser.add_argument('--queries', type=int, default=200, help='Количество запросов в бенчмарке')
+    arg_parser.add_argument('-k', type=int, default=10)
+    args = arg_parser.parse_args()
+
+    ids, names, texts = load_vacancy_corpus(args.vacancies)
+    engine = TfidfSimilarityEngine().fit(texts)
+
+    start = time.perf_counter()
+    index = IVFIndex.from_engine(engine, n_components=args.components, nlist=args.nlist)
+    print(f"IVF построен за {time.perf_counter() - start:.2f} сек: {len(texts)} вакансий, {index.nlist} списков")
+
+    # В качестве запросов используются названия вакансий корпуса
+    sample = random.Random(0).sample(names, min(args.queries, len(names)))
+    benchmark_recall(engine, index, sample, k=args.k)
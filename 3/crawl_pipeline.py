@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Маркер завершения потока данных между стадиями
+_STOP = object()
+
+
+class RateLimiter:
+    """
+    Потокобезопасный ограничитель частоты запросов: не чаще одного вызова
+    в `interval` секунд на все потоки, которые его разделяют.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """Блокирует поток до момента, когда можно выполнить следующий запрос."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Stage:
+    """
+    Стадия конвейера: пул потоков, читающих элементы из своей ограниченной очереди.
+
+    Функция стадии принимает элемент и возвращает итерируемый набор результатов
+    для следующей стадии (или None, если элемент отбрасывается).
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Iterable[Any]]],
+                 workers: int = 1, queue_size: int = 100):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.next_stage: Optional['Stage'] = None
+
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._alive = 0
+
+    def put(self, item: Any):
+        """Кладет элемент во входную очередь стадии (блокируется, если очередь полна)."""
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+
+            try:
+                outputs = self.func(item)
+                emitted = 0
+                if outputs is not None:
+                    for output in outputs:
+                        if self.next_stage is not None:
+                            self.next_stage.put(output)
+                        emitted += 1
+                with self._lock:
+                    self.processed += 1
+                    self.emitted += emitted
+            except Exception as e:
+                with self._lock:
+                    self.processed += 1
+                    self.errors += 1
+                print(f"Ошибка на стадии '{self.name}': {e}")
+
+        with self._lock:
+            self._alive -= 1
+            last_worker = self._alive == 0
+            if last_worker:
+                self.finished_at = time.monotonic()
+
+        # Последний завершившийся поток закрывает вход следующей стадии
+        if last_worker and self.next_stage is not None:
+            self.next_stage.close()
+
+    def start(self) -> List[threading.Thread]:
+        """Запускает потоки стадии."""
+        self.started_at = time.monotonic()
+        self._alive = self.workers
+        threads = []
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def close(self):
+        """Сообщает всем потокам стадии, что новых элементов не будет."""
+        for _ in range(self.workers):
+            self.queue.put(_STOP)
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает текущие метрики стадии: пропускную способность и глубину очереди."""
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'emitted': self.emitted,
+            'errors': self.errors,
+            'throughput': self.processed / elapsed if elapsed > 0 else 0.0,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_depth,
+        }
+
+
+class Pipeline:
+    """
+    Потоковый конвейер из последовательных стадий с ограниченными очередями.
+
+    Сеть, разбор и запись на диск выполняются одновременно: каждая стадия
+    масштабируется своим числом потоков, а ограниченные очереди не дают
+    быстрой стадии накопить в памяти больше, чем успевает обработать медленная.
+    """
+
+    def __init__(self, stages: List[Stage], report_interval: float = 5.0,
+                 on_report: Optional[Callable[[], None]] = None):
+        self.stages = stages
+        self.report_interval = report_interval
+        # Дополнительный вывод при каждом отчете (напр., текущие результаты)
+        self.on_report = on_report
+        for current, following in zip(stages, stages[1:]):
+            current.next_stage = following
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Печатает и возвращает метрики всех стадий."""
+        stats = [stage.stats() for stage in self.stages]
+        for s in stats:
+            print(f"  [{s['stage']}] потоков: {s['workers']}, обработано: {s['processed']}, "
+                  f"передано дальше: {s['emitted']}, ошибок: {s['errors']}, "
+                  f"{s['throughput']:.2f} эл./сек, очередь: {s['queue_depth']} (макс. {s['max_queue_depth']})")
+        if self.on_report is not None:
+            self.on_report()
+        return stats
+
+    def run(self, source: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Прогоняет элементы источника через все стадии и дожидается завершения.
+
+        Args:
+            source (Iterable[Any]): Входные элементы первой стадии.
+
+        Returns:
+            List[Dict[str, Any]]: Итоговые метрики по каждой стадии.
+        """
+        threads = []
+        for stage in self.stages:
+            threads.extend(stage.start())
+
+        done = threading.Event()
+
+        def reporter():
+            while not done.wait(self.report_interval):
+                print("Состояние конвейера:")
+                self.report()
+
+        reporter_thread = threading.Thread(target=reporter, name="pipeline-reporter", daemon=True)
+        reporter_thread.start()
+
+        first = self.stages[0]
+        for item in source:
+            first.put(item)
+        first.close()
+
+        for thread in threads:
+            thread.join()
+        done.set()
+        reporter_thread.join()
+
+        print("Итоговые метрики конвейера:")
+        return self.report()
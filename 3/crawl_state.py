@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# Файл с отметками последних опубликованных вакансий по каждому запросу
+STATE_FILE = 'crawl_state.json'
+
+# Формат поля published_at в ответах API hh.ru, например 2024-01-15T10:30:00+0300
+PUBLISHED_AT_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+
+def parse_published_at(value: str) -> datetime:
+    """Преобразует published_at из ответа hh.ru в datetime с часовым поясом."""
+    return datetime.strptime(value, PUBLISHED_AT_FORMAT)
+
+
+class HighWaterMarks:
+    """
+    Отметки "самая свежая вакансия" (максимальный published_at) по каждому запросу.
+
+    Следующий запуск передает отметку в параметр date_from, поэтому API
+    возвращает только вакансии, опубликованные после предыдущего сбора.
+
+    Выдача запрашивается от новых к старым, поэтому отметка сдвигается только
+    после обхода запроса без ошибок загрузки (complete): если обход прервался
+    из-за ошибки, непросмотренные страницы собираются при следующем запуске с
+    прежней отметкой. Ограничение количества страниц считается завершенным
+    обходом - вакансии за его пределами не собираются намеренно.
+
+    Вакансии, которые не удалось обработать, передаются в hold(): новая
+    отметка не заходит дальше самой ранней из них, и следующий запуск
+    получит их снова.
+    """
+
+    def __init__(self, filename: str = STATE_FILE):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self.marks: Dict[str, str] = {}
+        # Отметки текущего обхода, еще не подтвержденные complete()
+        self._pending: Dict[str, str] = {}
+        # Самый ранний published_at среди вакансий, которые не удалось обработать
+        self._holds: Dict[str, str] = {}
+        if os.path.isfile(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                self.marks = json.load(f)
+
+    def get(self, key: str) -> Optional[str]:
+        """Возвращает отметку для запроса или None, если запрос еще не собирался."""
+        return self.marks.get(key)
+
+    def observe(self, key: str, items: Iterable[Dict[str, Any]]):
+        """Учитывает published_at полученных вакансий в отметке текущего обхода."""
+        with self._lock:
+            latest = self._pending.get(key) or self.marks.get(key)
+            for item in items:
+                published_at = item.get('published_at')
+                if not published_at:
+                    continue
+                if latest is None or parse_published_at(published_at) > parse_published_at(latest):
+                    latest = published_at
+            if latest is not None:
+                self._pending[key] = latest
+
+    def hold(self, key: str, items: Iterable[Dict[str, Any]]):
+        """Учитывает вакансии, которые не удалось обработать: отметка не сдвинется дальше них."""
+        with self._lock:
+            earliest = self._holds.get(key)
+            for item in items:
+                published_at = item.get('published_at')
+                if not published_at:
+                    continue
+                if earliest is None or parse_published_at(published_at) < parse_published_at(earliest):
+                    earliest = published_at
+            if earliest is not None:
+                self._holds[key] = earliest
+
+    def complete(self, key: str):
+        """Обход запроса завершен без ошибок загрузки: отметка текущего обхода становится постоянной."""
+        with self._lock:
+            hold = self._holds.pop(key, None)
+            if key not in self._pending:
+                return
+            latest = self._pending.pop(key)
+            if hold is not None and parse_published_at(hold) < parse_published_at(latest):
+                latest = hold
+            self.marks[key] = latest
+
+    def save(self):
+        """Атомарно сохраняет отметки: сначала во временный файл, затем переименование."""
+        tmp_name = self.filename + '.tmp'
+        with self._lock:
+            with open(tmp_name, 'w', encoding='utf-8') as f:
+                json.dump(self.marks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, self.filename)
+
@@ -0,0 +1,117 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Tuple
+
+import numpy as np
+
+# Простое число Мерсенна 2^61 - 1 для универсального хеширования (a * x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+class MinHasher:
+    """
+    MinHash-сигнатуры текстов по словесным шинглам.
+
+    Доля совпадающих позиций двух сигнатур - несмещенная оценка
+    коэффициента Жаккара множеств шинглов двух текстов.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a, b < 2^32, хеш шингла < 2^32, поэтому a * x + b помещается в uint64 без переполнения
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-битные хеши словесных шинглов текста."""
+        tokens = _WORD_RE.findall(text.lower())
+        size = self.shingle_size
+        if len(tokens) <= size:
+            grams = {' '.join(tokens)}
+        else:
+            grams = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                           dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash-сигнатура текста длины num_perm."""
+        hashes = self.shingles(text)[None, :]
+        return ((self.a * hashes + self.b) % _MERSENNE_PRIME & _MAX_HASH).min(axis=1)
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """Матрица сигнатур (по строке на текст)."""
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for row, text in enumerate(texts):
+            result[row] = self.signature(text)
+        return result
+
+
+def find_duplicate_clusters(texts: List[str], threshold: float = 0.8, num_perm: int = 128,
+                            bands: int = 16, shingle_size: int = 3) -> np.ndarray:
+    """
+    Группирует почти одинаковые тексты с помощью MinHash и LSH-разбиения на полосы.
+
+    Сигнатура делится на bands полос; тексты, совпавшие хотя бы в одной полосе,
+    становятся кандидатами, и кандидаты объединяются, если оценка
+    коэффициента Жаккара не ниже threshold. Попарное сравнение всего корпуса
+    не выполняется, поэтому время работы близко к линейному.
+
+    Returns:
+        np.ndarray: Для каждого текста - индекс представителя его кластера
+        (первого по порядку текста кластера).
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm должно делиться на bands без остатка")
+
+    signatures = MinHasher(num_perm=num_perm, shingle_size=shingle_size).signatures(texts)
+    rows = num_perm // bands
+
+    parent = np.arange(len(texts))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(len(texts)):
+            buckets[band_values[i].tobytes()].append(i)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            first = members[0]
+            for other in members[1:]:
+                root_first, root_other = find(first), find(other)
+                if root_first == root_other:
+                    continue
+                if np.mean(signatures[first] == signatures[other]) >= threshold:
+                    # Представителем остается текст с меньшим индексом
+                    parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    return np.array([find(i) for i in range(len(texts))])
+
+
+def deduplicate(ids: List[str], names: List[str], texts: List[str],
+                **kwargs) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Оставляет по одной вакансии (первой) из каждой группы почти одинаковых описаний.
+
+    Параметры kwargs передаются в find_duplicate_clusters.
+    """
+    if not texts:
+        return ids, names, texts
+
+    clusters = find_duplicate_clusters(texts, **kwargs)
+    keep = np.flatnonzero(clusters == np.arange(len(texts)))
+    print(f"Дедупликация: {len(texts)} вакансий -> {len(keep)} уникальных")
+    return [ids[i] for i in keep], [names[i] for i in keep], [texts[i] for i in keep]
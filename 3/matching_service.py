@@ -0,0 +1,248 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import requests
+
+from resume_parser import parse_resume_lines
+from vacancy_index import VacancyIndex
+
+
+class LatencyStats:
+    """
+    Потокобезопасная статистика запросов: перцентили задержки по последним
+    `window` запросам и средняя пропускная способность с момента запуска.
+    """
+
+    def __init__(self, window: int = 10000):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency_ms: float, error: bool = False):
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self.requests += 1
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self._latencies)
+            requests_count, errors = self.requests, self.errors
+        elapsed = time.monotonic() - self.started_at
+        return {
+            'requests': requests_count,
+            'errors': errors,
+            'qps': requests_count / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+        }
+
+
+class MatchingService:
+    """
+    Подбор вакансий по навыкам или HTML-резюме поверх загруженного один раз VacancyIndex.
+
+    Запрос - словарь с одним из ключей:
+        'skills': {'soft_skills': [...], 'hard_skills': [...]} - навыки резюме;
+        'resume_html': str - HTML-резюме, навыки извлекаются так же, как в 3.2.py;
+        'text': str - произвольный текст навыков;
+    и необязательным 'k' (количество вакансий в ответе).
+
+    С nprobe сервис использует IVF индекса (vacancy_index.py ann): точно
+    оцениваются только кандидаты из nprobe ближайших списков.
+    """
+
+    def __init__(self, index: VacancyIndex, default_k: int = 10, nprobe: Optional[int] = None):
+        if nprobe and index.ann is None:
+            raise ValueError("Для приближенного поиска постройте IVF: vacancy_index.py ann")
+        self.index = index
+        self.default_k = default_k
+        self.nprobe = nprobe
+        self.stats = LatencyStats()
+
+    @staticmethod
+    def validate(query: Any):
+        """Проверяет структуру запроса; ValueError, если запрос некорректен."""
+        if not isinstance(query, dict):
+            raise ValueError("Запрос должен быть JSON-объектом")
+        if 'skills' in query:
+            skills = query['skills']
+            if not isinstance(skills, dict):
+                raise ValueError("'skills' должен быть объектом с 'soft_skills' и 'hard_skills'")
+            for field in ('soft_skills', 'hard_skills'):
+                values = skills.get(field)
+                if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                    raise ValueError(f"'skills.{field}' должен быть списком строк")
+        elif 'resume_html' in query:
+            if not isinstance(query['resume_html'], str):
+                raise ValueError("'resume_html' должен быть строкой")
+        elif 'text' in query:
+            if not isinstance(query['text'], str):
+                raise ValueError("'text' должен быть строкой")
+        else:
+            raise ValueError("Запрос должен содержать 'skills', 'resume_html' или 'text'")
+        if 'k' in query and (isinstance(query['k'], bool) or not isinstance(query['k'], int) or query['k'] <= 0):
+            raise ValueError("'k' должен быть положительным целым числом")
+
+    def match(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Топ-k вакансий для одного запроса."""
+        self.validate(query)
+        k = query.get('k', self.default_k)
+        if 'skills' in query:
+            results = self.index.top_k_for_skills(query['skills'], k, self.nprobe)
+        elif 'resume_html' in query:
+            results = self.index.top_k_for_skills(parse_resume_lines(query['resume_html'].split('\n')), k,
+                                                  self.nprobe)
+        elif 'text' in query:
+            results = self.index.top_k(query['text'], k, self.nprobe)
+        return [{'vacancy_id': vacancy_id, 'vacancy_name': name, 'similarity': score}
+                for vacancy_id, name, score in results]
+
+    def match_batch(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Топ-k вакансий для каждого запроса пакета."""
+        if not isinstance(queries, list):
+            raise ValueError("'queries' должен быть списком запросов")
+        # Пакет проверяется целиком до расчета, чтобы ошибка не тратила время на остальные запросы
+        for query in queries:
+            self.validate(query)
+        return [self.match(query) for query in queries]
+
+
+class _MatchingHandler(BaseHTTPRequestHandler):
+    service: MatchingService = None
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            stats = self.service.stats.snapshot()
+            stats['vacancies'] = len(self.service.index)
+            self._send_json(200, stats)
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        error = False
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/match':
+                self._send_json(200, {'results': self.service.match(payload)})
+            elif self.path == '/match/batch':
+                if not isinstance(payload, dict):
+                    raise ValueError("Тело запроса должно быть JSON-объектом с 'queries'")
+                self._send_json(200, {'results': self.service.match_batch(payload.get('queries', []))})
+            else:
+                error = True
+                self._send_json(404, {'error': 'not found'})
+        except ValueError as e:
+            # Сюда же попадает некорректный JSON (JSONDecodeError)
+            error = True
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            error = True
+            print(f"Ошибка при обработке запроса {self.path}: {e!r}")
+            self._send_json(500, {'error': 'internal error'})
+        finally:
+            self.service.stats.record((time.perf_counter() - start) * 1000, error)
+
+    def log_message(self, format, *args):
+        # Журнал каждого запроса искажает замеры задержки под нагрузкой
+        pass
+
+
+def serve(index_dir: str, host: str = '127.0.0.1', port: int = 8000, k: int = 10, nprobe: Optional[int] = None):
+    """Загружает индекс один раз и обслуживает запросы до остановки (Ctrl+C)."""
+    start = time.perf_counter()
+    service = MatchingService(VacancyIndex(index_dir), default_k=k, nprobe=nprobe)
+    print(f"Индекс загружен за {time.perf_counter() - start:.2f} сек: {len(service.index)} вакансий")
+
+    handler = type('MatchingHandler', (_MatchingHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Сервис подбора вакансий: http://{host}:{port} (POST /match, POST /match/batch, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Статистика сервиса:", service.stats.snapshot())
+
+
+def load_test(url: str, queries: List[Dict[str, Any]], total_requests: int = 1000,
+              concurrency: int = 8) -> Dict[str, Any]:
+    """
+    Нагрузочный тест сервиса: total_requests запросов к POST /match в concurrency потоков.
+
+    Returns:
+        Dict[str, Any]: Количество запросов и ошибок, QPS, p50/p99 задержки на стороне клиента.
+    """
+    stats = LatencyStats(window=total_requests)
+    local = threading.local()
+
+    def send(i):
+        # Одна сессия (keep-alive соединение) на поток
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        error = False
+        try:
+            response = local.session.post(f"{url}/match", json=queries[i % len(queries)], timeout=30)
+            error = response.status_code != 200
+        except requests.RequestException:
+            error = True
+        stats.record((time.perf_counter() - start) * 1000, error)
+
+    stats.started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(total_requests)))
+    return stats.snapshot()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Локальный сервис подбора вакансий по навыкам и резюме')
+    arg_parser.add_argument('command', choices=['serve', 'loadtest'])
+    arg_parser.add_argument('--index', default='vacancy_index', help='Папка индекса (vacancy_index.py build)')
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('-k', type=int, default=10, help='Количество вакансий в ответе по умолчанию')
+    arg_parser.add_argument('--requests', type=int, default=1000, help='Количество запросов (loadtest)')
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='Количество потоков клиента (loadtest)')
+    arg_parser.add_argument('--nprobe', type=int, default=None,
+                            help='serve: приближенный поиск по nprobe спискам IVF индекса (по умолчанию точный)')
+    args = arg_parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.index, args.host, args.port, args.k, args.nprobe)
+    else:
+        # Запросы нагрузочного теста - названия вакансий из того же индекса
+        index = VacancyIndex(args.index)
+        names = random.Random(0).sample(index.names, min(200, len(index.names)))
+        queries = [{'text': name, 'k': args.k} for name in names]
+
+        url = f"http://{args.host}:{args.port}"
+        client = load_test(url, queries, args.requests, args.concurrency)
+        print(f"Клиент: {client['requests']} запросов, ошибок: {client['errors']}, "
+              f"{client['qps']:.1f} запр./сек, p50 {client['p50_ms']:.2f} мс, p99 {client['p99_ms']:.2f} мс")
+        server = requests.get(f"{url}/stats", timeout=10).json()
+        print(f"Сервер: {server['requests']} запросов, p50 {server['p50_ms']:.2f} мс, p99 {server['p99_ms']:.2f} мс")
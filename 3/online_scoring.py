@@ -0,0 +1,80 @@
+import heapq
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from similarity_engine import HashingSimilarityEngine
+
+
+class OnlineTopK:
+    """
+    Оценка вакансий по резюме прямо во время сбора с хранением текущего топ-k.
+
+    Векторы навыков резюме (хешированные n-граммы) вычисляются один раз.
+    Каждая полученная вакансия обновляет онлайн-IDF и сразу сравнивается
+    с резюме; IDF пересчитывается только для признаков вакансии и резюме.
+    В памяти хранится только куча из k лучших вакансий.
+    """
+
+    def __init__(self, resume_skills: Dict[str, List[str]], k: int = 20, engine: HashingSimilarityEngine = None):
+        self.k = k
+        self.engine = engine or HashingSimilarityEngine()
+        self.soft_counts = self.engine.hashed_counts([' '.join(resume_skills['soft_skills'])])
+        self.hard_counts = self.engine.hashed_counts([' '.join(resume_skills['hard_skills'])])
+        self.scored = 0
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def _similarity(self, doc: sp.csr_matrix, query: sp.csr_matrix) -> float:
+        if not doc.nnz or not query.nnz:
+            return 0.0
+        doc_weights = doc.data * self.engine.idf_at(doc.indices)
+        query_weights = query.data * self.engine.idf_at(query.indices)
+        common, doc_pos, query_pos = np.intersect1d(doc.indices, query.indices,
+                                                    assume_unique=True, return_indices=True)
+        if not len(common):
+            return 0.0
+        dot = float(doc_weights[doc_pos] @ query_weights[query_pos])
+        return dot / (np.linalg.norm(doc_weights) * np.linalg.norm(query_weights)) * 100
+
+    def score(self, vacancy_id: str, name: str, text: str) -> Dict[str, Any]:
+        """Оценивает вакансию и при необходимости помещает ее в топ-k."""
+        doc = self.engine.hashed_counts([text or ''])
+        with self._lock:
+            self.engine.observe(doc)
+            soft = self._similarity(doc, self.soft_counts)
+            hard = self._similarity(doc, self.hard_counts)
+            result = {
+                'vacancy_id': vacancy_id,
+                'vacancy_name': name,
+                'soft_similarity': soft,
+                'hard_similarity': hard,
+                'overall_similarity': (soft + hard) / 2,
+            }
+            # Порядковый номер разрешает равенство сходства без сравнения словарей
+            entry = (result['overall_similarity'], self.scored, result)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+            self.scored += 1
+        return result
+
+    def top(self) -> List[Dict[str, Any]]:
+        """Текущий топ-k по убыванию общего сходства."""
+        with self._lock:
+            return [result for _, _, result in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+
+    def report(self, limit: int = 5):
+        """Печатает текущие лучшие вакансии."""
+        print(f"Оценено вакансий: {self.scored}, текущий топ:")
+        for result in self.top()[:limit]:
+            print(f"  {result['overall_similarity']:6.2f}%  {result['vacancy_id']}  {result['vacancy_name']}")
+
+    def save(self, filename: str = 'online_top_vacancies.json'):
+        """Сохраняет текущий топ-k в JSON файл."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.top(), f, ensure_ascii=False, indent=2)
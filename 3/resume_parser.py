@@ -0,0 +1,227 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Категория таблицы резюме с профессиональными навыками, значение которой
+# может продолжаться на следующих строках
+PROFESSIONAL_CATEGORY = 'Профессиональная специализация и владение компьютером'
+
+
+def split_composite_skills(skill_text: str) -> List[str]:
+    """Разбивает составные навыки на отдельные элементы"""
+    result = []
+
+    # Если навык содержит двоеточие, разбиваем его
+    if ':' in skill_text:
+        # Разделяем на категорию и значения
+        category, values = skill_text.split(':', 1)
+        # Разбиваем значения по запятым
+        individual_skills = [v.strip() for v in values.split(',')]
+        result.extend(individual_skills)
+    else:
+        result.append(skill_text)
+
+    return result
+
+
+def _windows(lines: Iterable[str], size: int = 4) -> Iterator[Tuple[Optional[str], ...]]:
+    """Скользящее окно из текущей строки и size - 1 следующих (None за концом файла)."""
+    it = iter(lines)
+    window = deque(islice(it, size))
+    while window:
+        yield tuple(window) + (None,) * (size - len(window))
+        window.popleft()
+        window.extend(islice(it, 1))
+
+
+def _continues_professional(raw_line: str) -> bool:
+    """Продолжается ли значение профессиональных навыков на этой строке."""
+    stripped = raw_line.strip()
+    return ('<td class=c2>' in raw_line or '<br>' in raw_line or
+            (bool(stripped) and not stripped.startswith('<tr')))
+
+
+def _professional_skills(collected: List[str]) -> List[str]:
+    """Разбивает собранное значение профессиональных навыков на отдельные навыки."""
+    skills = []
+    full_text = ' '.join(collected)
+    # Разбиваем по номерам пунктов
+    for section in full_text.split('<br>'):
+        section = section.strip()
+        if section and not section.isspace():
+            if '.' in section and section[0].isdigit():
+                section = section.split('.', 1)[1].strip()
+
+            # Разбиваем составные навыки
+            skills.extend(split_composite_skills(section))
+    return skills
+
+
+def parse_resume_lines(lines: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Однопроходный разбор строк HTML-резюме в soft/hard навыки.
+
+    Строки читаются один раз со взглядом вперед на три строки; многострочное
+    значение профессиональных навыков накапливается по мере чтения, а не
+    повторным просмотром файла от каждой строки таблицы.
+    """
+    skills = {'soft_skills': [], 'hard_skills': []}
+    # Незавершенные значения профессиональных навыков: [номер первой строки, собранные строки]
+    collectors = []
+
+    for i, (raw_line, line1, line2, line3) in enumerate(_windows(lines)):
+        # Дописываем строку в незавершенные многострочные значения
+        for collector in list(collectors):
+            start, collected = collector
+            if i < start:
+                continue
+            if _continues_professional(raw_line):
+                line_content = raw_line.strip()
+                if '<td class=c2>' in line_content:
+                    line_content = line_content.replace('<td class=c2>', '').replace('</td>', '')
+                if line_content and not line_content.startswith('<tr'):
+                    collected.append(line_content)
+            else:
+                skills['hard_skills'].extend(_professional_skills(collected))
+                collectors.remove(collector)
+
+        line = raw_line.strip()
+
+        # Ищем строки таблицы; следующие две строки содержат категорию и значение
+        if ('<tr class=odd>' not in line and '<tr class=even>' not in line) or line2 is None:
+            continue
+
+        category_line = line1.strip()
+        value_line = line2.strip()
+
+        # Извлекаем текст между тегами td
+        if '<td class=c1>' not in category_line or '<td class=c2>' not in value_line:
+            continue
+
+        category = category_line.replace('<td class=c1>', '').replace('</td>', '').strip()
+        value = value_line.replace('<td class=c2>', '').replace('</td>', '').strip()
+
+        # Обрабатываем многострочные значения
+        if not value and line3 is not None:
+            next_line = line3.strip()
+            if not next_line.startswith('<tr') and not next_line.startswith('</tr'):
+                value = next_line.replace('<br>', ' ').strip()
+
+        if not value:
+            continue
+
+        # Soft Skills
+        if category == 'Личные качества':
+            skills['soft_skills'].extend([skill.strip() for skill in value.split(',')])
+
+        elif category == 'Увлечения':
+            hobbies = value.replace('<br>', ';').split(';')
+            for hobby in hobbies:
+                hobby = hobby.strip()
+                if hobby and ':' not in hobby:  # Простые увлечения
+                    skills['soft_skills'].append(hobby)
+                elif ':' in hobby:  # Сложные структуры (Игры: ...)
+                    hobby_type, hobby_list = hobby.split(':', 1)
+                    skills['soft_skills'].append(hobby_type.strip())
+                    # Разбиваем список игр/книг
+                    skills['soft_skills'].extend([h.strip() for h in hobby_list.split(',')])
+
+        elif category == 'Личные достижения':
+            skills['soft_skills'].append(value)
+
+        # Hard Skills
+        elif category == 'Владение языками':
+            for lang in value.split(';'):
+                lang = lang.strip()
+                if '-' in lang:
+                    lang_name, level = lang.split('-', 1)
+                    skills['hard_skills'].append(f"{lang_name.strip()} ({level.strip()})")
+                else:
+                    skills['hard_skills'].append(lang)
+
+        elif category == PROFESSIONAL_CATEGORY:
+            # Значение начинается со строки value_line и собирается дальше по ходу чтения
+            collectors.append([i + 2, []])
+
+    # Значения, которые продолжались до конца файла
+    for _, collected in collectors:
+        skills['hard_skills'].extend(_professional_skills(collected))
+
+    # Очистка и фильтрация навыков, дубликаты убираются с сохранением порядка
+    for key in ('soft_skills', 'hard_skills'):
+        skills[key] = list(dict.fromkeys(skill for skill in skills[key]
+                                         if skill and len(skill) > 1 and skill != 'br'))
+
+    # Дополнительная очистка для hard skills (убираем пустые и слишком короткие)
+    skills['hard_skills'] = [skill for skill in skills['hard_skills'] if len(skill) > 2]
+
+    return skills
+
+
+def extract_skills_from_resume(html_file: str) -> Dict[str, List[str]]:
+    """Извлекает soft/hard навыки из HTML-резюме (выгрузка с таблицей категорий)."""
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return parse_resume_lines(content.split('\n'))
+
+
+def _ingest_chunk(resumes_folder: str, file_names: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Разбирает часть резюме (выполняется в процессе пула)."""
+    resumes, skill_types, skill_values = [], [], []
+    for resume_file in file_names:
+        try:
+            skills = extract_skills_from_resume(os.path.join(resumes_folder, resume_file))
+        except Exception as e:
+            print(f"Ошибка при обработке резюме {resume_file}: {e}")
+            continue
+        for skill_type in ('soft_skills', 'hard_skills'):
+            for skill in skills[skill_type]:
+                resumes.append(resume_file)
+                skill_types.append(skill_type)
+                skill_values.append(skill)
+    return resumes, skill_types, skill_values
+
+
+def _skills_table(chunk_results: Iterable[Tuple[List[str], List[str], List[str]]]) -> pd.DataFrame:
+    resumes, skill_types, skill_values = [], [], []
+    for chunk_resumes, chunk_types, chunk_skills in chunk_results:
+        resumes.extend(chunk_resumes)
+        skill_types.extend(chunk_types)
+        skill_values.extend(chunk_skills)
+    return pd.DataFrame({
+        'resume': pd.Categorical(resumes),
+        'skill_type': pd.Categorical(skill_types, categories=['soft_skills', 'hard_skills']),
+        'skill': skill_values,
+    })
+
+
+def ingest_resumes(resumes_folder: str, workers: Optional[int] = None, chunk_size: int = 64) -> pd.DataFrame:
+    """
+    Разбирает все HTML-резюме папки пулом процессов.
+
+    Returns:
+        pd.DataFrame: Таблица навыков в длинном формате: resume и skill_type
+        (категориальные столбцы) и skill.
+    """
+    file_names = sorted(name for name in os.listdir(resumes_folder) if name.endswith(('.htm', '.html')))
+    chunks = [file_names[i:i + chunk_size] for i in range(0, len(file_names), chunk_size)]
+    folders = [resumes_folder] * len(chunks)
+
+    if workers == 1 or len(chunks) <= 1:
+        return _skills_table(map(_ingest_chunk, folders, chunks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _skills_table(executor.map(_ingest_chunk, folders, chunks))
+
+
+def skills_by_resume(skills_table: pd.DataFrame) -> Dict[str, Dict[str, List[str]]]:
+    """Собирает таблицу навыков обратно в словари {'soft_skills': [...], 'hard_skills': [...]} по резюме."""
+    result = {}
+    for resume in skills_table['resume'].cat.categories:
+        result[resume] = {'soft_skills': [], 'hard_skills': []}
+    for resume, skill_type, skill in zip(skills_table['resume'], skills_table['skill_type'], skills_table['skill']):
+        result[resume][skill_type].append(skill)
+    return result
@@ -0,0 +1,192 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Iterable, Iterator, List, Optional, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+class TfidfSimilarityEngine:
+    """
+    Пакетный расчет косинусного сходства по TF-IDF.
+
+    Векторайзер обучается один раз на всем корпусе вакансий, поэтому IDF
+    отражает реальную частоту терминов в корпусе, а сходство со всеми
+    вакансиями считается одним произведением разреженной матрицы на вектор.
+
+    Если передан normalizer (text_normalization.TextNormalizer), тексты
+    перед векторизацией приводятся к леммам без русских и английских
+    стоп-слов с кэшированием нормализованных документов.
+    """
+
+    def __init__(self, normalizer=None, **vectorizer_params):
+        params = {'stop_words': 'english', 'min_df': 1}
+        if normalizer is not None:
+            params.update({'preprocessor': normalizer.normalize, 'stop_words': None})
+        params.update(vectorizer_params)
+        self.normalizer = normalizer
+        self.vectorizer = TfidfVectorizer(**params)
+        self.matrix = None
+
+    def fit(self, documents: List[str], extra_documents: Iterable[str] = ()) -> 'TfidfSimilarityEngine':
+        """
+        Обучает векторайзер и строит матрицу TF-IDF корпуса.
+
+        Args:
+            documents (List[str]): Тексты вакансий (строки итоговой матрицы).
+            extra_documents (Iterable[str]): Тексты, которые участвуют только в построении
+                словаря и IDF (напр., навыки из резюме), но не попадают в матрицу.
+        """
+        documents = list(documents)
+        extra = [text for text in extra_documents if text]
+        # Корпус токенизируется один раз; строки дополнительных текстов отбрасываются.
+        # Строки нормированы по L2, поэтому скалярное произведение равно косинусу
+        self.matrix = self.vectorizer.fit_transform(documents + extra)[:len(documents)]
+        if self.normalizer is not None:
+            self.normalizer.flush()
+        return self
+
+    def transform(self, texts: List[str]):
+        """Переводит тексты в нормированные TF-IDF векторы обученного словаря."""
+        return self.vectorizer.transform(texts)
+
+    def score(self, text: Optional[str]) -> np.ndarray:
+        """
+        Сходство текста со всеми документами корпуса в процентах.
+
+        Returns:
+            np.ndarray: Массив длины корпуса; нули, если текст пустой.
+        """
+        if not text:
+            return np.zeros(self.matrix.shape[0])
+        query = self.transform([text])
+        return (self.matrix @ query.T).toarray().ravel() * 100
+
+    def top_k_batch(self, soft_texts: List[str], hard_texts: List[str], k: int = 10,
+                    block_size: int = 128) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Топ-k документов корпуса для каждой пары (soft, hard) текстов по общему сходству.
+
+        Тексты всех резюме переводятся в две матрицы, а сходство с корпусом
+        считается разреженным произведением блоками по block_size резюме,
+        поэтому в памяти одновременно находится не больше block_size x N значений.
+        Внутри блока k лучших выбираются частичным отбором (argpartition),
+        полностью сортируются только они.
+
+        Yields:
+            Tuple[int, np.ndarray, np.ndarray, np.ndarray]: номер резюме, индексы
+            документов по убыванию общего сходства, soft и hard сходство в процентах.
+        """
+        soft_queries = self.transform(soft_texts)
+        hard_queries = self.transform(hard_texts)
+        corpus_t = self.matrix.T.tocsc()
+        k = min(k, self.matrix.shape[0])
+        if k <= 0:
+            return
+
+        for start in range(0, soft_queries.shape[0], block_size):
+            end = min(start + block_size, soft_queries.shape[0])
+            soft = (soft_queries[start:end] @ corpus_t).toarray() * 100
+            hard = (hard_queries[start:end] @ corpus_t).toarray() * 100
+            overall = (soft + hard) / 2
+
+            top = np.argpartition(-overall, k - 1, axis=1)[:, :k]
+            for row in range(end - start):
+                order = top[row][np.argsort(-overall[row, top[row]])]
+                yield start + row, order, soft[row, order], hard[row, order]
+
+
+class HashingSimilarityEngine(TfidfSimilarityEngine):
+    """
+    Потоковый вариант TfidfSimilarityEngine без словаря.
+
+    Признаки - хеши словесных (1-2) и символьных (3-5) n-грамм в пространстве
+    фиксированной ширины, поэтому новые термины не требуют переобучения,
+    а память не растет вместе со словарем. IDF считается онлайн по счетчикам
+    документной частоты, которые обновляются при каждом add().
+    """
+
+    def __init__(self, n_features: int = 2 ** 20, stop_words: Optional[str] = 'english', normalizer=None):
+        common = {'n_features': n_features, 'alternate_sign': False, 'norm': None}
+        word_params = {'stop_words': stop_words}
+        if normalizer is not None:
+            word_params = {'preprocessor': normalizer.normalize, 'stop_words': None}
+        self.normalizer = normalizer
+        self.word_vectorizer = HashingVectorizer(analyzer='word', ngram_range=(1, 2), **word_params, **common)
+        self.char_vectorizer = HashingVectorizer(analyzer='char_wb', ngram_range=(3, 5), **common)
+        self.n_docs = 0
+        self.document_frequency = np.zeros(2 * n_features, dtype=np.int64)
+        self.counts = sp.csr_matrix((0, 2 * n_features))
+        self._matrix = None
+
+    def hashed_counts(self, texts: List[str]) -> sp.csr_matrix:
+        """Частоты хешированных n-грамм (слова и символы в общем пространстве признаков)."""
+        if not texts:
+            return sp.csr_matrix((0, self.document_frequency.size))
+        return sp.hstack([self.word_vectorizer.transform(texts),
+                          self.char_vectorizer.transform(texts)]).tocsr()
+
+    def observe(self, counts: sp.csr_matrix):
+        """Учитывает частоты n-грамм документов в онлайн-статистике IDF."""
+        np.add.at(self.document_frequency, counts.indices, 1)
+        self.n_docs += counts.shape[0]
+        self._matrix = None
+
+    def update_idf(self, texts: Iterable[str]):
+        """Учитывает тексты в онлайн-статистике документной частоты, не сохраняя их."""
+        self.observe(self.hashed_counts([text for text in texts if text]))
+
+    @property
+    def idf(self) -> np.ndarray:
+        return self.idf_at(slice(None))
+
+    def idf_at(self, columns) -> np.ndarray:
+        """IDF только для выбранных признаков (без пересчета всего пространства)."""
+        # Та же сглаженная формула, что в TfidfVectorizer
+        return np.log((1 + self.n_docs) / (1 + self.document_frequency[columns])) + 1
+
+    def fit(self, documents: List[str], extra_documents: Iterable[str] = ()) -> 'HashingSimilarityEngine':
+        """Начинает корпус заново: сбрасывает статистику и добавляет документы."""
+        self.n_docs = 0
+        self.document_frequency[:] = 0
+        self.counts = sp.csr_matrix((0, self.document_frequency.size))
+        self.update_idf(extra_documents)
+        self.add(documents)
+        if self.normalizer is not None:
+            self.normalizer.flush()
+        return self
+
+    def add(self, documents: List[str]):
+        """Добавляет вакансии в корпус: они сразу доступны для score() без переобучения."""
+        counts = self.hashed_counts(documents)
+        self.observe(counts)
+        self.counts = sp.vstack([self.counts, counts]).tocsr()
+
+    def transform(self, texts: List[str]):
+        """Переводит тексты в нормированные TF-IDF векторы по текущей онлайн-статистике."""
+        return normalize(self.hashed_counts(texts) @ sp.diags(self.idf))
+
+    @property
+    def matrix(self):
+        # Матрица корпуса пересчитывается лениво после изменения IDF
+        if self._matrix is None:
+            self._matrix = normalize(self.counts @ sp.diags(self.idf))
+        return self._matrix
+
+    def score_stream(self, documents: List[str], text: Optional[str]) -> np.ndarray:
+        """
+        Сходство текста с новыми вакансиями, которые не сохраняются в корпусе:
+        они только обновляют IDF, поэтому память остается постоянной.
+        """
+        self.update_idf(documents)
+        if not text or not documents:
+            return np.zeros(len(documents))
+        return (self.transform(documents) @ self.transform([text]).T).toarray().ravel() * 100
+
+
+def create_engine(vectorizer: str = 'tfidf', normalizer=None) -> TfidfSimilarityEngine:
+    """Создает движок сходства: 'tfidf' - обучаемый словарь, 'hashing' - потоковый без словаря."""
+    if vectorizer == 'hashing':
+        return HashingSimilarityEngine(normalizer=normalizer)
+    if vectorizer == 'tfidf':
+        return TfidfSimilarityEngine(normalizer=normalizer)
+    raise ValueError(f"Неизвестный тип векторайзера: {vectorizer}")
@@ -0,0 +1,105 @@
+import html
+import json
+import os
+import re
+import sys
+import time
+from typing import Optional
+
+# Любой HTML-тег, включая комментарии и теги с атрибутами
+_TAG_RE = re.compile(r'<[^>]*>')
+# Последовательности пробельных символов (включая неразрывный пробел после unescape)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(description: Optional[str]) -> str:
+    """
+    Быстро переводит HTML-описание вакансии в обычный текст без построения DOM-дерева.
+
+    Теги заменяются пробелами (чтобы соседние элементы списка не склеивались),
+    HTML-сущности раскодируются, пробелы схлопываются.
+    """
+    if not description:
+        return ''
+    text = _TAG_RE.sub(' ', description)
+    text = html.unescape(text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def cleaned_text_path(vacancy_path: str) -> str:
+    """Путь к файлу очищенного текста рядом с JSON вакансии: 123.json -> 123.txt."""
+    return os.path.splitext(vacancy_path)[0] + '.txt'
+
+
+def save_cleaned_text(vacancy_path: str, description: Optional[str]) -> str:
+    """
+    Очищает описание и сохраняет текст рядом с JSON вакансии.
+
+    Текст пишется во временный файл и атомарно переименовывается: оборванная
+    запись не оставит усеченный кэш, который новее JSON и считался бы верным.
+    """
+    text = html_to_text(description)
+    text_path = cleaned_text_path(vacancy_path)
+    tmp_path = f"{text_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, text_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return text
+
+
+def load_cleaned_text(vacancy_path: str, description: Optional[str]) -> str:
+    """
+    Возвращает очищенный текст вакансии из кэша рядом с JSON.
+
+    Если кэша нет или JSON изменился позже него, описание очищается заново
+    и кэш перезаписывается. Если кэш записать нельзя (напр., папка корпуса
+    только для чтения), возвращается очищенный текст без кэширования.
+    """
+    text_path = cleaned_text_path(vacancy_path)
+    if os.path.isfile(text_path) and os.path.getmtime(text_path) >= os.path.getmtime(vacancy_path):
+        with open(text_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    try:
+        return save_cleaned_text(vacancy_path, description)
+    except OSError:
+        return html_to_text(description)
+
+
+def benchmark_cleaning(vacancies_folder: str):
+    """Сравнивает скорость html_to_text и BeautifulSoup(html.parser) на корпусе вакансий."""
+    from bs4 import BeautifulSoup
+
+    descriptions = []
+    for vacancy_file in os.listdir(vacancies_folder):
+        if vacancy_file.endswith('.json'):
+            with open(os.path.join(vacancies_folder, vacancy_file), 'r', encoding='utf-8') as f:
+                description = json.load(f).get('description', '')
+            if description:
+                descriptions.append(description)
+
+    print(f"Описаний в корпусе: {len(descriptions)}")
+    if not descriptions:
+        return
+
+    start = time.perf_counter()
+    for description in descriptions:
+        BeautifulSoup(description, 'html.parser').get_text()
+    soup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for description in descriptions:
+        html_to_text(description)
+    fast_time = time.perf_counter() - start
+
+    print(f"BeautifulSoup: {soup_time:.3f} сек ({soup_time / len(descriptions) * 1000:.3f} мс на описание)")
+    print(f"html_to_text:  {fast_time:.3f} сек ({fast_time / len(descriptions) * 1000:.3f} мс на описание)")
+    print(f"Ускорение: {soup_time / fast_time:.1f}x" if fast_time > 0 else "Ускорение: не измерено")
+
+
+if __name__ == "__main__":
+    benchmark_cleaning(sys.argv[1] if len(sys.argv) > 1 else 'vacancies_desc')
@@ -0,0 +1,145 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Лемматизация русского языка через pymorphy, если он установлен;
+# иначе используется упрощенное отсечение окончаний
+try:
+    import pymorphy3 as pymorphy
+except ImportError:
+    try:
+        import pymorphy2 as pymorphy
+    except ImportError:
+        pymorphy = None
+
+RUSSIAN_STOP_WORDS = frozenset("""
+а без более бы был была были было быть в вам вас весь во вот все всего всех вы где да даже
+для до его ее её если есть еще ещё же за здесь и из или им их к как ко когда кто ли либо
+между меня мне может мы на над надо наш не него нее неё нет ни них но ну о об однако он она
+они оно от очень по под при с со так также такой там те тем то того тоже той только том ты
+у уже хотя чего чей чем что чтобы чье чья эта эти это этого этой этом этот я
+наш наша наше наши ваш ваша ваше ваши свой своя свое своё свои который которая которое
+которые котором которых которой также будет будут будем являться является являются
+""".split())
+
+STOP_WORDS = RUSSIAN_STOP_WORDS | ENGLISH_STOP_WORDS
+
+# Версия алгоритма нормализации: увеличивается при изменении токенизации или
+# отсечения окончаний, чтобы не использовать документы, нормализованные по-старому
+NORMALIZER_VERSION = 1
+
+# Окончания русских слов для упрощенной нормализации (от длинных к коротким)
+_RUSSIAN_ENDINGS = sorted("""
+ами ями ого его ему ому ыми ими ая яя ое ее ие ые ой ей ий ый ую юю ом ем ам ям ах ях
+ых их ым им ов ев ию ия ья ье ьи ть ти а я о е и ы у ю ь
+""".split(), key=len, reverse=True)
+
+_WORD_RE = re.compile(r'\w+')
+_CYRILLIC_RE = re.compile('[а-яё]')
+
+
+def _stem_russian(token: str) -> str:
+    for ending in _RUSSIAN_ENDINGS:
+        if token.endswith(ending) and len(token) - len(ending) >= 3:
+            return token[:-len(ending)]
+    return token
+
+
+def _stem_english(token: str) -> str:
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('s') and not token.endswith('ss') and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+class TextNormalizer:
+    """
+    Нормализация русско-английских текстов: токенизация, стоп-слова, леммы.
+
+    Леммы кэшируются в ограниченном LRU-кэше по токену, а нормализованные
+    документы - на диске (SQLite) по хешу содержимого, поэтому повторные
+    запуски не токенизируют заново неизменившиеся тексты. В ключ кэша входит
+    конфигурация нормализатора (лемматизатор, стоп-слова, версия алгоритма),
+    поэтому документы, нормализованные иначе, не используются.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, token_cache_size: int = 100000,
+                 commit_every: int = 1000, stop_words: FrozenSet[str] = STOP_WORDS):
+        self.morph = pymorphy.MorphAnalyzer() if pymorphy is not None else None
+        self.stop_words = frozenset(stop_words)
+        self.config = self.config_tag()
+        self.lemma = lru_cache(maxsize=token_cache_size)(self._lemma)
+        self.commit_every = commit_every
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if cache_path:
+            self._db = sqlite3.connect(cache_path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS documents (hash TEXT PRIMARY KEY, normalized TEXT)')
+
+    def config_tag(self) -> str:
+        """Строка конфигурации: лемматизатор, хеш набора стоп-слов и версия алгоритма."""
+        backend = pymorphy.__name__ if self.morph is not None else 'stem'
+        stop_words_hash = hashlib.sha1('\n'.join(sorted(self.stop_words)).encode('utf-8')).hexdigest()[:12]
+        return f"{backend}:{stop_words_hash}:v{NORMALIZER_VERSION}"
+
+    def _lemma(self, token: str) -> str:
+        if _CYRILLIC_RE.search(token):
+            if self.morph is not None:
+                return self.morph.parse(token)[0].normal_form
+            return _stem_russian(token)
+        return _stem_english(token)
+
+    def tokenize(self, text: Optional[str]) -> List[str]:
+        """Токены текста в нижнем регистре, без стоп-слов, приведенные к лемме."""
+        tokens = []
+        for token in _WORD_RE.findall((text or '').lower()):
+            if token in self.stop_words or token.isdigit():
+                continue
+            lemma = self.lemma(token)
+            if lemma not in self.stop_words:
+                tokens.append(lemma)
+        return tokens
+
+    def normalize(self, text: Optional[str]) -> str:
+        """
+        Нормализованный текст (леммы через пробел) с кэшированием по хешу содержимого.
+        Подходит как preprocessor для векторайзеров scikit-learn.
+        """
+        if self._db is None:
+            return ' '.join(self.tokenize(text))
+
+        key = hashlib.sha1(f"{self.config}\n{text or ''}".encode('utf-8')).hexdigest()
+        with self._lock:
+            row = self._db.execute('SELECT normalized FROM documents WHERE hash = ?', (key,)).fetchone()
+        if row is not None:
+            return row[0]
+
+        normalized = ' '.join(self.tokenize(text))
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO documents VALUES (?, ?)', (key, normalized))
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._db.commit()
+                self._pending = 0
+        return normalized
+
+    def flush(self):
+        """Записывает на диск накопленные нормализованные документы."""
+        if self._db is not None:
+            with self._lock:
+                self._db.commit()
+                self._pending = 0
+
+    def close(self):
+        """Сохраняет кэш и закрывает базу."""
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
@@ -0,0 +1,87 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, List, Optional, Tuple
+
+from text_cleaning import load_cleaned_text
+
+# Начиная с такого количества файлов загрузка распараллеливается по процессам;
+# на маленьких папках запуск пула дороже самой загрузки
+PARALLEL_MIN_FILES = 2000
+
+# Количество частей на один процесс: части поменьше выравнивают нагрузку
+CHUNKS_PER_WORKER = 4
+
+
+def _load_chunk(vacancies_folder: str, file_names: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Загружает и очищает часть файлов папки вакансий (выполняется в процессе пула)."""
+    vacancy_ids = []
+    vacancy_names = []
+    descriptions = []
+
+    for vacancy_file in file_names:
+        try:
+            vacancy_path = os.path.join(vacancies_folder, vacancy_file)
+            with open(vacancy_path, 'r', encoding='utf-8') as f:
+                vacancy_data = json.load(f)
+
+            vacancy_description = vacancy_data.get('description', '')
+
+            if vacancy_description:
+                # Очищаем описание от HTML тегов
+                descriptions.append(load_cleaned_text(vacancy_path, vacancy_description))
+                vacancy_names.append(vacancy_data.get('name', ''))
+                vacancy_ids.append(vacancy_data.get('id', ''))
+
+        except Exception as e:
+            print(f"Ошибка при обработке вакансии {vacancy_file}: {e}")
+            continue
+
+    return vacancy_ids, vacancy_names, descriptions
+
+
+def load_vacancy_corpus(vacancies_folder: str, workers: Optional[int] = None,
+                        skip_ids: Collection[str] = ()) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Загружает вакансии из папки (по одному JSON на вакансию) и очищает описания от HTML.
+
+    Вакансии без описания пропускаются. Очищенный текст берется из кэша
+    рядом с JSON (см. text_cleaning.load_cleaned_text), поэтому HTML
+    разбирается только один раз для каждой вакансии.
+
+    Список файлов делится на части, которые обрабатываются пулом процессов;
+    каждая часть возвращается тремя списками строк, а не списком словарей,
+    чтобы передача результатов между процессами была дешевой.
+
+    Args:
+        vacancies_folder (str): Папка с JSON вакансий.
+        workers (Optional[int]): Количество процессов. None - все ядра для больших папок
+            (от PARALLEL_MIN_FILES файлов) и один процесс для маленьких.
+        skip_ids (Collection[str]): id вакансий, файлы которых ('<id>.json') не читаются.
+
+    Returns:
+        Tuple[List[str], List[str], List[str]]: id вакансий, названия и очищенные описания.
+    """
+    file_names = sorted(name for name in os.listdir(vacancies_folder)
+                        if name.endswith('.json') and name[:-len('.json')] not in skip_ids)
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(file_names) >= PARALLEL_MIN_FILES else 1
+    if workers <= 1 or len(file_names) < 2:
+        return _load_chunk(vacancies_folder, file_names)
+
+    chunk_count = min(len(file_names), workers * CHUNKS_PER_WORKER)
+    chunk_size = -(-len(file_names) // chunk_count)
+    chunks = [file_names[i:i + chunk_size] for i in range(0, len(file_names), chunk_size)]
+
+    vacancy_ids = []
+    vacancy_names = []
+    descriptions = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map сохраняет порядок частей, поэтому результат не зависит от числа процессов
+        for ids, names, texts in executor.map(_load_chunk, [vacancies_folder] * len(chunks), chunks):
+            vacancy_ids.extend(ids)
+            vacancy_names.extend(names)
+            descriptions.extend(texts)
+
+    return vacancy_ids, vacancy_names, descriptions
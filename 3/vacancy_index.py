@@ -0,0 +1,399 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ann_index import IVFIndex
+from similarity_engine import TfidfSimilarityEngine
+from vacancy_corpus import load_vacancy_corpus
+
+# Параметры векторайзера по умолчанию, как в TfidfSimilarityEngine
+DEFAULT_VECTORIZER_PARAMS = {'stop_words': 'english', 'min_df': 1}
+
+
+class VacancyIndex:
+    """
+    Персистентный поисковый индекс по корпусу вакансий.
+
+    На диске хранятся словарь и IDF обученного векторайзера, матрица TF-IDF
+    в формате CSC (по столбцу на термин, т.е. инвертированный индекс) и
+    очищенные тексты для периодического переобучения. Матрица загружается
+    через memory-map, поэтому запрос читает с диска только списки вакансий
+    для терминов запроса.
+
+    Новые вакансии добавляются в дельта-сегмент с текущими словарем и IDF;
+    словарь и IDF пересчитываются при rebuild(), когда дельта становится
+    заметной относительно основного сегмента.
+
+    Каждая сборка пишется в новую папку сегмента (segment-NNNNN), а файл
+    current.json переключается на нее атомарно последним. Файлы, которые
+    уже открыты (и отображены в память) другими экземплярами, не
+    перезаписываются, а прерванная сборка оставляет прежний индекс целым.
+
+    По желанию рядом с основным сегментом сохраняется IVF (build_ann), и
+    запросы с nprobe точно оценивают только вакансии из ближайших списков
+    IVF и дельта-сегмента.
+    """
+
+    CURRENT_FILE = 'current.json'
+    SEGMENT_PREFIX = 'segment-'
+    META_FILE = 'meta.json'
+    IDF_FILE = 'idf.npy'
+    DATA_FILE = 'postings_data.npy'
+    INDICES_FILE = 'postings_indices.npy'
+    INDPTR_FILE = 'postings_indptr.npy'
+    DELTA_FILE = 'delta.npz'
+    DOCS_FILE = 'docs.json'
+    TEXTS_FILE = 'texts.jsonl'
+    ANN_DIR = 'ann'
+
+    def __init__(self, index_dir: str, mmap: bool = True):
+        self.index_dir = index_dir
+        self.segment_dir = self.current_segment(index_dir)
+        mmap_mode = 'r' if mmap else None
+
+        with open(self._path(self.META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.vocabulary: Dict[str, int] = meta['vocabulary']
+        self.vectorizer_params: Dict[str, Any] = meta['vectorizer_params']
+        self.base_docs: int = meta['base_docs']
+        self.rebuild_ratio: float = meta['rebuild_ratio']
+
+        self.idf = np.load(self._path(self.IDF_FILE), mmap_mode=mmap_mode)
+        self.postings_data = np.load(self._path(self.DATA_FILE), mmap_mode=mmap_mode)
+        self.postings_indices = np.load(self._path(self.INDICES_FILE), mmap_mode=mmap_mode)
+        self.postings_indptr = np.load(self._path(self.INDPTR_FILE), mmap_mode=mmap_mode)
+
+        if os.path.isfile(self._path(self.DELTA_FILE)):
+            self.delta = sp.load_npz(self._path(self.DELTA_FILE)).tocsr()
+        else:
+            self.delta = sp.csr_matrix((0, len(self.vocabulary)))
+
+        with open(self._path(self.DOCS_FILE), 'r', encoding='utf-8') as f:
+            docs = json.load(f)
+        self.ids: List[str] = docs['ids']
+        self.names: List[str] = docs['names']
+
+        # Добавление, прерванное между записью дельты и списка вакансий, отбрасывается
+        delta_docs = min(self.delta.shape[0], len(self.ids) - self.base_docs)
+        self.delta = self.delta[:delta_docs]
+        del self.ids[self.base_docs + delta_docs:], self.names[self.base_docs + delta_docs:]
+        self._known_ids = set(self.ids)
+
+        # Анализатор (токенизация и стоп-слова) не требует обучения
+        self.analyzer = TfidfVectorizer(**self.vectorizer_params).build_analyzer()
+
+        ann_dir = self._path(self.ANN_DIR)
+        self.ann: Optional[IVFIndex] = IVFIndex.load(ann_dir, mmap=mmap) if os.path.isdir(ann_dir) else None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.segment_dir, name)
+
+    @classmethod
+    def current_segment(cls, index_dir: str) -> str:
+        """Папка действующего сегмента (индексы старого формата хранятся прямо в index_dir)."""
+        current_path = os.path.join(index_dir, cls.CURRENT_FILE)
+        if not os.path.isfile(current_path):
+            return index_dir
+        with open(current_path, 'r', encoding='utf-8') as f:
+            return os.path.join(index_dir, json.load(f)['segment'])
+
+    @classmethod
+    def _segments(cls, index_dir: str) -> List[str]:
+        return sorted(name for name in os.listdir(index_dir) if name.startswith(cls.SEGMENT_PREFIX))
+
+    @staticmethod
+    def _write_json(path: str, data: Any):
+        """Атомарная запись JSON: временный файл и переименование."""
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def build(cls, index_dir: str, ids: List[str], names: List[str], texts: List[str],
+              rebuild_ratio: float = 0.2, **vectorizer_params) -> 'VacancyIndex':
+        """
+        Строит индекс с нуля в новой папке сегмента и делает его действующим.
+
+        Args:
+            index_dir (str): Папка индекса.
+            ids (List[str]): id вакансий.
+            names (List[str]): Названия вакансий.
+            texts (List[str]): Очищенные описания вакансий.
+            rebuild_ratio (float): Доля добавленных вакансий относительно основного сегмента,
+                после которой рекомендуется переобучить словарь и IDF.
+        """
+        os.makedirs(index_dir, exist_ok=True)
+        params = dict(DEFAULT_VECTORIZER_PARAMS)
+        params.update(vectorizer_params)
+
+        engine = TfidfSimilarityEngine(**params).fit(texts)
+        postings = engine.matrix.tocsc()
+        postings.sort_indices()
+
+        segments = cls._segments(index_dir)
+        number = int(segments[-1][len(cls.SEGMENT_PREFIX):]) + 1 if segments else 0
+        segment = f"{cls.SEGMENT_PREFIX}{number:05d}"
+        segment_dir = os.path.join(index_dir, segment)
+        os.makedirs(segment_dir)
+
+        def path(name):
+            return os.path.join(segment_dir, name)
+
+        np.save(path(cls.IDF_FILE), engine.vectorizer.idf_)
+        np.save(path(cls.DATA_FILE), postings.data)
+        np.save(path(cls.INDICES_FILE), postings.indices)
+        np.save(path(cls.INDPTR_FILE), postings.indptr)
+
+        with open(path(cls.TEXTS_FILE), 'w', encoding='utf-8') as f:
+            for vacancy_id, name, text in zip(ids, names, texts):
+                f.write(json.dumps({'id': vacancy_id, 'name': name, 'text': text}, ensure_ascii=False) + '\n')
+        with open(path(cls.DOCS_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'ids': list(ids), 'names': list(names)}, f, ensure_ascii=False)
+
+        meta = {
+            'vocabulary': {term: int(col) for term, col in engine.vectorizer.vocabulary_.items()},
+            'vectorizer_params': params,
+            'base_docs': len(ids),
+            'rebuild_ratio': rebuild_ratio,
+        }
+        with open(path(cls.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        # Переключение на новый сегмент - последний шаг сборки
+        previous = cls.current_segment(index_dir)
+        cls._write_json(os.path.join(index_dir, cls.CURRENT_FILE), {'segment': segment})
+
+        # Предыдущий сегмент остается для экземпляров, которые еще открывают его файлы;
+        # более старые (и недостроенные) удаляются
+        keep = {segment, os.path.basename(previous)}
+        for name in cls._segments(index_dir):
+            if name not in keep:
+                shutil.rmtree(os.path.join(index_dir, name), ignore_errors=True)
+
+        return cls(index_dir)
+
+    @classmethod
+    def from_folder(cls, vacancies_folder: str, index_dir: str, **kwargs) -> 'VacancyIndex':
+        """Строит индекс по папке вакансий (по одному JSON на вакансию)."""
+        ids, names, texts = load_vacancy_corpus(vacancies_folder)
+        return cls.build(index_dir, ids, names, texts, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def vectorize(self, texts: List[str]) -> sp.csr_matrix:
+        """
+        Переводит тексты в нормированные TF-IDF векторы по сохраненным словарю и IDF.
+        Термины вне словаря игнорируются до следующего rebuild().
+        """
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            counts = Counter(self.vocabulary[token] for token in self.analyzer(text or '')
+                             if token in self.vocabulary)
+            if not counts:
+                continue
+            doc_cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * self.idf[doc_cols]
+            weights /= np.linalg.norm(weights)
+            rows.extend([row] * len(counts))
+            cols.extend(doc_cols)
+            values.extend(weights)
+        return sp.csr_matrix((values, (rows, cols)), shape=(len(texts), len(self.vocabulary)))
+
+    def scores(self, text: Optional[str], nprobe: Optional[int] = None) -> np.ndarray:
+        """
+        Сходство текста со всеми вакансиями индекса в процентах.
+
+        Основной сегмент обходится по инвертированному индексу: читаются
+        только столбцы терминов запроса. С nprobe (и построенным IVF) точно
+        оцениваются только кандидаты из nprobe списков IVF, остальные вакансии
+        основного сегмента получают 0; дельта-сегмент оценивается целиком.
+        """
+        scores = np.zeros(len(self.ids))
+        if not text:
+            return scores
+
+        query = self.vectorize([text])
+        base = scores[:self.base_docs]
+        if nprobe and self.ann is not None:
+            if query.nnz:
+                candidates, exact = self.ann.rerank(query, nprobe)
+                base[candidates] = exact
+        else:
+            for col, weight in zip(query.indices, query.data):
+                start, end = self.postings_indptr[col], self.postings_indptr[col + 1]
+                if start == end:
+                    continue
+                base[self.postings_indices[start:end]] += weight * self.postings_data[start:end]
+
+        if self.delta.shape[0]:
+            scores[self.base_docs:] = (self.delta @ query.T).toarray().ravel()
+
+        return scores * 100
+
+    def _top(self, scores: np.ndarray, k: int) -> List[Tuple[str, str, float]]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        # Частичный отбор k лучших вместо полной сортировки
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], self.names[i], float(scores[i])) for i in top]
+
+    def top_k(self, text: str, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """
+        Топ-k вакансий для набора навыков.
+
+        Args:
+            nprobe (Optional[int]): Приближенный поиск по nprobe спискам IVF (None - точный).
+
+        Returns:
+            List[Tuple[str, str, float]]: (id, название, сходство в процентах) по убыванию сходства.
+        """
+        return self._top(self.scores(text, nprobe), k)
+
+    def top_k_for_skills(self, resume_skills: Dict[str, List[str]], k: int = 10,
+                         nprobe: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """Топ-k вакансий по общему сходству (среднее soft и hard) для навыков из резюме."""
+        soft = self.scores(' '.join(resume_skills['soft_skills']), nprobe)
+        hard = self.scores(' '.join(resume_skills['hard_skills']), nprobe)
+        return self._top((soft + hard) / 2, k)
+
+    def base_matrix(self) -> sp.csr_matrix:
+        """Матрица TF-IDF основного сегмента по строкам (вакансиям)."""
+        return sp.csc_matrix((self.postings_data, self.postings_indices, self.postings_indptr),
+                             shape=(self.base_docs, len(self.vocabulary))).tocsr()
+
+    def build_ann(self, n_components: int = 128, nlist: Optional[int] = None) -> IVFIndex:
+        """
+        Строит IVF по основному сегменту и сохраняет его в папке сегмента;
+        следующие экземпляры индекса загружают его без переобучения.
+        """
+        ann = IVFIndex.fit(self.base_matrix(), n_components=n_components, nlist=nlist)
+        ann_dir = self._path(self.ANN_DIR)
+        if os.path.isdir(ann_dir):
+            # Открытые другими экземплярами файлы не перезаписываются: старая папка удаляется целиком
+            old_dir = ann_dir + '.old'
+            shutil.rmtree(old_dir, ignore_errors=True)
+            os.replace(ann_dir, old_dir)
+            ann.save(ann_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        else:
+            ann.save(ann_dir)
+        self.ann = IVFIndex.load(ann_dir)
+        return self.ann
+
+    def add(self, ids: List[str], names: List[str], texts: List[str]) -> int:
+        """
+        Добавляет новые вакансии в дельта-сегмент (уже известные id пропускаются).
+
+        Returns:
+            int: Количество добавленных вакансий.
+        """
+        new = [(i, n, t) for i, n, t in zip(ids, names, texts) if i not in self._known_ids]
+        if not new:
+            return 0
+
+        new_ids, new_names, new_texts = (list(column) for column in zip(*new))
+        self.delta = sp.vstack([self.delta, self.vectorize(new_texts)]).tocsr()
+        self.ids.extend(new_ids)
+        self.names.extend(new_names)
+        self._known_ids.update(new_ids)
+
+        # Порядок записи: тексты, дельта, список вакансий. Дельта и список заменяются
+        # атомарно, лишние строки прерванного добавления отбрасываются при загрузке
+        with open(self._path(self.TEXTS_FILE), 'a', encoding='utf-8') as f:
+            for vacancy_id, name, text in new:
+                f.write(json.dumps({'id': vacancy_id, 'name': name, 'text': text}, ensure_ascii=False) + '\n')
+        delta_path = self._path(self.DELTA_FILE)
+        with open(delta_path + '.tmp', 'wb') as f:
+            sp.save_npz(f, self.delta)
+        os.replace(delta_path + '.tmp', delta_path)
+        self._write_json(self._path(self.DOCS_FILE), {'ids': self.ids, 'names': self.names})
+
+        return len(new)
+
+    def needs_rebuild(self) -> bool:
+        """Пора ли пересчитать словарь и IDF (дельта превысила долю rebuild_ratio)."""
+        return self.delta.shape[0] > self.rebuild_ratio * max(self.base_docs, 1)
+
+    def rebuild(self) -> 'VacancyIndex':
+        """
+        Переобучает словарь и IDF по всем сохраненным текстам и объединяет сегменты
+        в новой папке сегмента; экземпляры, открытые раньше, продолжают читать старую.
+        """
+        # Повторы id возможны после прерванного add(): остается последняя версия
+        docs: Dict[str, Tuple[str, str]] = {}
+        with open(self._path(self.TEXTS_FILE), 'r', encoding='utf-8') as f:
+            for line in f:
+                doc = json.loads(line)
+                docs[doc['id']] = (doc['name'], doc['text'])
+        ids = list(docs)
+        names = [name for name, _ in docs.values()]
+        texts = [text for _, text in docs.values()]
+
+        params = dict(self.vectorizer_params)
+        rebuilt = self.build(self.index_dir, ids, names, texts, rebuild_ratio=self.rebuild_ratio, **params)
+        # IVF строится заново по новому словарю, если он был у прежнего сегмента
+        if self.ann is not None:
+            rebuilt.build_ann(n_components=self.ann.n_components)
+        self.__dict__.update(rebuilt.__dict__)
+        return self
+
+    def update_from_folder(self, vacancies_folder: str) -> int:
+        """
+        Добавляет новые вакансии из папки и при необходимости переобучает индекс.
+        Файлы уже проиндексированных вакансий не читаются.
+        """
+        added = self.add(*load_vacancy_corpus(vacancies_folder, skip_ids=self._known_ids))
+        if self.needs_rebuild():
+            print("Дельта-сегмент превысил порог, переобучение словаря и IDF...")
+            self.rebuild()
+        return added
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Персистентный индекс вакансий для поиска top-k')
+    arg_parser.add_argument('command', choices=['build', 'update', 'query', 'ann'],
+                            help='ann - построить IVF для приближенного поиска по готовому индексу')
+    arg_parser.add_argument('--vacancies', default='vacancies_desc', help='Папка с JSON вакансий')
+    arg_parser.add_argument('--index', default='vacancy_index', help='Папка индекса')
+    arg_parser.add_argument('--skills', default='', help='Навыки для поиска (режим query)')
+    arg_parser.add_argument('-k', type=int, default=10, help='Количество вакансий в ответе')
+    arg_parser.add_argument('--ann', action='store_true', help='build: сразу построить IVF')
+    arg_parser.add_argument('--components', type=int, default=128, help='IVF: размерность после TruncatedSVD')
+    arg_parser.add_argument('--nlist', type=int, default=None, help='IVF: количество списков (по умолчанию sqrt(N))')
+    arg_parser.add_argument('--nprobe', type=int, default=None,
+                            help='query: приближенный поиск по nprobe спискам IVF (по умолчанию точный)')
+    args = arg_parser.parse_args()
+
+    if args.command in ('build', 'ann'):
+        if args.command == 'build':
+            index = VacancyIndex.from_folder(args.vacancies, args.index)
+            print(f"Индекс построен: {len(index)} вакансий, {len(index.vocabulary)} терминов")
+        else:
+            index = VacancyIndex(args.index)
+        if args.ann or args.command == 'ann':
+            start = time.perf_counter()
+            ann = index.build_ann(n_components=args.components, nlist=args.nlist)
+            print(f"IVF построен за {time.perf_counter() - start:.2f} сек: {ann.nlist} списков")
+    elif args.command == 'update':
+        index = VacancyIndex(args.index)
+        added = index.update_from_folder(args.vacancies)
+        print(f"Добавлено вакансий: {added}, всего в индексе: {len(index)}")
+    else:
+        index = VacancyIndex(args.index)
+        start = time.perf_counter()
+        results = index.top_k(args.skills, args.k, nprobe=args.nprobe)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for vacancy_id, name, score in results:
+            print(f"{score:6.2f}%  {vacancy_id}  {name}")
+        print(f"Время запроса: {elapsed_ms:.2f} мс")
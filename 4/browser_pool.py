@@ -0,0 +1,214 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+from fetchers import SeleniumFetcher, collect
+from hh_selenium import HHAPISeleniumParser, cached_driver_path
+from rate_limiter import AdaptiveRateLimiter
+from sinks import NDJSONSink
+
+# Маркер остановки рабочих потоков
+_STOP = object()
+
+
+class BrowserPool:
+    """
+    Пул headless-браузеров для HHAPISeleniumParser.
+
+    size браузеров запускаются один раз и разбирают страницы из общей очереди,
+    поэтому пропускная способность растет с размером пула, а запуск Chrome
+    (и поиск chromedriver) не повторяется на каждый тест или запрос.
+    Браузер перезапускается после max_pages страниц или когда память Chrome
+    превышает max_memory_mb. Остальные параметры (fast_load, capture_network,
+    page_timeout) передаются в HHAPISeleniumParser каждого браузера.
+
+    Исход каждой страницы сообщается общему AdaptiveRateLimiter: пустой ответ
+    или ошибка снижают частоту запросов всего пула. Если браузер не удалось
+    запустить, ожидающая его страница завершается ошибкой, а когда в пуле не
+    остается работающих браузеров, ошибкой завершаются все страницы очереди.
+    """
+
+    def __init__(self, size: int = 4, headless: bool = True, max_pages: int = 200,
+                 max_memory_mb: float = 1024, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 **parser_options):
+        self.size = size
+        self.headless = headless
+        self.parser_options = parser_options
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.recycled = 0
+        self._tasks = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._error: Optional[BaseException] = None
+        self._driver_path: Optional[str] = None
+
+    def start(self) -> 'BrowserPool':
+        """Запускает браузеры пула (параллельно, каждый в своем потоке)."""
+        # Драйвер определяется один раз до запуска потоков, а не каждым браузером
+        self._driver_path = cached_driver_path()
+        with self._lock:
+            self._alive = self.size
+            self._error = None
+        for i in range(self.size):
+            thread = threading.Thread(target=self._worker, name=f"browser-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def close(self):
+        """Дожидается выполнения поставленных страниц и закрывает браузеры."""
+        for _ in self._threads:
+            self._tasks.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> 'BrowserPool':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def browser_memory_mb(parser: HHAPISeleniumParser) -> float:
+        """Память chromedriver и всех запущенных им процессов Chrome в МБ."""
+        try:
+            root = psutil.Process(parser.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / 1024 / 1024
+        except (psutil.Error, AttributeError):
+            return 0.0
+
+    def _new_parser(self) -> HHAPISeleniumParser:
+        return HHAPISeleniumParser(headless=self.headless, driver_path=self._driver_path, **self.parser_options)
+
+    def _worker(self):
+        parser = None
+        pages = 0
+        try:
+            parser = self._new_parser()
+            while True:
+                task = self._tasks.get()
+                if task is _STOP:
+                    break
+                future, page, query, per_page, only_with_salary, date_from, order_by = task
+                # Страница отменена (обход прерван раньше)
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                # Перезапуск откладывается до следующей страницы: в конце работы он не нужен
+                if pages >= self.max_pages or self.browser_memory_mb(parser) > self.max_memory_mb:
+                    parser.close()
+                    parser = None
+                    try:
+                        parser = self._new_parser()
+                    except Exception as e:
+                        future.set_exception(e)
+                        raise
+                    pages = 0
+                    with self._lock:
+                        self.recycled += 1
+
+                self.rate_limiter.wait()
+                start = time.perf_counter()
+                try:
+                    data = parser.get_vacancies_from_page(page, query, per_page, only_with_salary, date_from,
+                                                          order_by)
+                except Exception as e:
+                    self.rate_limiter.on_throttle()
+                    future.set_exception(e)
+                else:
+                    # Пустой ответ - ошибка или блокировка: частота снижается для всего пула
+                    if data and 'items' in data:
+                        self.rate_limiter.on_success()
+                    else:
+                        self.rate_limiter.on_throttle()
+                    future.set_result((data, (time.perf_counter() - start) * 1000))
+                pages += 1
+        except Exception as e:
+            print(f"Браузер {threading.current_thread().name} остановлен из-за ошибки: {e}")
+            with self._lock:
+                self._error = e
+        finally:
+            if parser is not None:
+                parser.close()
+            self._worker_exited()
+
+    def _worker_exited(self):
+        """Учитывает остановку браузера; без работающих браузеров завершает ошибкой всю очередь."""
+        with self._lock:
+            self._alive -= 1
+            if self._alive > 0:
+                return
+            while True:
+                try:
+                    task = self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if task is not _STOP and task[0].set_running_or_notify_cancel():
+                    task[0].set_exception(self._no_workers_error())
+
+    def _no_workers_error(self) -> RuntimeError:
+        return RuntimeError(f"В пуле не осталось работающих браузеров (последняя ошибка: {self._error!r})")
+
+    def submit(self, page: int, query: str, per_page: int = 50, only_with_salary: bool = False,
+               date_from: Optional[str] = None, order_by: Optional[str] = None) -> Future:
+        """
+        Ставит страницу в очередь пула.
+
+        Returns:
+            Future: результат - (данные страницы, время загрузки в мс).
+        """
+        future = Future()
+        # Под блокировкой: последний остановившийся браузер не пропустит новую страницу
+        with self._lock:
+            if self._alive > 0:
+                self._tasks.put((future, page, query, per_page, only_with_salary, date_from, order_by))
+            else:
+                future.set_exception(self._no_workers_error())
+        return future
+
+    def iter_pages(self, tasks: List[Tuple[int, str]], per_page: int = 50, only_with_salary: bool = False,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[Tuple[Dict[str, Any], float]]:
+        """
+        Загружает страницы (номер, запрос) всеми браузерами пула и выдает результаты
+        в порядке tasks, каждый - как только он готов.
+        date_from задает по запросам момент публикации, начиная с которого нужны вакансии,
+        order_by - сортировку выдачи.
+        """
+        date_from = date_from or {}
+        futures = [self.submit(page, query, per_page, only_with_salary, date_from.get(query), order_by)
+                   for page, query in tasks]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Обход прерван раньше: еще не начатые страницы снимаются с очереди
+            for future in futures:
+                future.cancel()
+
+    def get_pages(self, tasks: List[Tuple[int, str]], per_page: int = 50, only_with_salary: bool = False,
+                  date_from: Optional[Dict[str, str]] = None,
+                  order_by: Optional[str] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Загружает страницы (номер, запрос) всеми браузерами пула; результаты в порядке tasks."""
+        return list(self.iter_pages(tasks, per_page, only_with_salary, date_from, order_by))
+
+    def search_vacancies(self, search_queries: List[str], pages_per_query: int = 5,
+                         sink: Optional[NDJSONSink] = None) -> List[Dict[str, Any]]:
+        """
+        Аналог HHAPISeleniumParser.search_vacancies, загружающий страницы всеми браузерами пула.
+        Первые страницы всех запросов сообщают количество страниц, остальные
+        загружаются одновременно; порядок вакансий тот же, что и при обходе одним браузером.
+        """
+        vacancies = collect(SeleniumFetcher(self), search_queries, pages=pages_per_query, per_page=50,
+                            sink=sink, tag_query=True)
+        print(f"Перезапусков браузеров: {self.recycled}")
+        return vacancies
@@ -0,0 +1,120 @@
+import argparse
+import os
+import time
+from typing import Dict, List, Sequence
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import psutil
+
+from fetchers import BACKENDS, Fetcher, create_fetcher
+
+# Количество страниц в тестах нагрузочного тестирования
+DEFAULT_REQUEST_COUNTS = (5, 10, 20, 30, 50)
+
+
+def get_memory_usage():
+    """Получает использование памяти текущим процессом в МБ"""
+    process = psutil.Process(os.getpid())
+    return process.memory_info().rss / 1024 / 1024
+
+
+def run_benchmark(fetcher: Fetcher, request_counts: Sequence[int] = DEFAULT_REQUEST_COUNTS,
+                  query: str = "Python", per_page: int = 50, pause: float = 2.0) -> pd.DataFrame:
+    """
+    Нагрузочное тестирование бэкенда: в каждом тесте загружаются страницы
+    0..count-1 по запросу query, измеряются время ответа, RPS и память.
+
+    Нагрузка одинакова для всех бэкендов, поэтому результаты можно сравнивать.
+
+    Returns:
+        pd.DataFrame: Метрики по каждому тесту.
+    """
+    detailed_metrics = []
+
+    for count in request_counts:
+        print(f"\n--- [{fetcher.name}] Тест с {count} запросами ---")
+
+        start_time = time.time()
+        results = fetcher.fetch_pages([(query, page) for page in range(count)], per_page)
+        total_time = time.time() - start_time
+
+        response_times = [elapsed_ms for data, elapsed_ms in results if data and 'items' in data]
+        successful_requests = len(response_times)
+        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+        rps = successful_requests / total_time if total_time > 0 else 0
+        memory_used = get_memory_usage()
+
+        detailed_metrics.append({
+            'backend': fetcher.name,
+            'requests_count': count,
+            'successful_requests': successful_requests,
+            'avg_response_time_ms': avg_response_time,
+            'rps': rps,
+            'memory_used_mb': memory_used,
+            'total_time_sec': total_time
+        })
+
+        print(f"Успешных запросов: {successful_requests}/{count}")
+        print(f"Среднее время ответа: {avg_response_time:.2f} мс")
+        print(f"RPS: {rps:.2f} запросов/сек")
+        print(f"Использование памяти: {memory_used:.2f} МБ")
+        print(f"Общее время теста: {total_time:.2f} сек")
+
+        # Уважаем лимиты API между тестами
+        time.sleep(pause)
+
+    return pd.DataFrame(detailed_metrics)
+
+
+def plot_benchmark(df_metrics: pd.DataFrame, output_dir: str, title: str):
+    """
+    Графики времени ответа, RPS и памяти по количеству страниц;
+    если в таблице несколько бэкендов, каждый рисуется своей линией.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    charts = [
+        ('avg_response_time_ms', 'Среднее время ответа', 'Время ответа (мс)', 'response_time.png'),
+        ('rps', 'Запросов в секунду (RPS)', 'Запросов в секунду', 'rps_performance.png'),
+        ('memory_used_mb', 'Использование памяти', 'Память (МБ)', 'memory_usage.png'),
+    ]
+
+    for column, chart_title, ylabel, filename in charts:
+        plt.figure(figsize=(10, 6))
+        for backend, group in df_metrics.groupby('backend', sort=False):
+            plt.plot(group['requests_count'], group[column], 'o-', linewidth=2, markersize=8, label=backend)
+        plt.title(f'{title}: {chart_title}')
+        plt.xlabel('Количество страниц')
+        plt.ylabel(ylabel)
+        plt.grid(True, alpha=0.3)
+        plt.legend()
+        plt.savefig(os.path.join(output_dir, filename), dpi=300, bbox_inches='tight')
+        plt.close()
+
+
+def compare_backends(backends: List[str], request_counts: Sequence[int] = DEFAULT_REQUEST_COUNTS,
+                     **fetcher_options) -> pd.DataFrame:
+    """Прогоняет одну и ту же нагрузку на нескольких бэкендах."""
+    frames: Dict[str, pd.DataFrame] = {}
+    for backend in backends:
+        with create_fetcher(backend, **fetcher_options) as fetcher:
+            frames[backend] = run_benchmark(fetcher, request_counts)
+    return pd.concat(frames.values(), ignore_index=True)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Сравнение бэкендов загрузки hh.ru на одинаковой нагрузке')
+    arg_parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=['requests', 'async'])
+    arg_parser.add_argument('--counts', nargs='+', type=int, default=list(DEFAULT_REQUEST_COUNTS),
+                            help='Количество страниц в тестах')
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='async: одновременных запросов')
+    arg_parser.add_argument('--browsers', type=int, default=1, help='selenium: размер пула браузеров')
+    arg_parser.add_argument('--fast', action='store_true', help='selenium/hybrid: быстрая загрузка страниц')
+    args = arg_parser.parse_args()
+
+    comparison = compare_backends(args.backends, args.counts, concurrency=args.concurrency,
+                                  browsers=args.browsers, fast_load=args.fast)
+    plot_benchmark(comparison, 'graphs/backend_comparison', 'Сравнение бэкендов')
+    comparison.to_csv('backend_comparison_metrics.csv', index=False, encoding='utf-8-sig')
+    print("\nМетрики сохранены в 'backend_comparison_metrics.csv'")
+    print(comparison.groupby('backend')[['avg_response_time_ms', 'rps']].mean())
@@ -0,0 +1,362 @@
+import abc
+import argparse
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from hh_requests import HHParser
+# Путь к папке 3 добавляет hh_requests
+from crawl_state import HighWaterMarks
+from seen_ids import SeenIds
+from sinks import NDJSONSink
+
+# Страница выдачи: (запрос, номер страницы)
+PageTask = Tuple[str, int]
+# Результат загрузки страницы: (JSON-ответ или None/{} при ошибке, время загрузки в мс)
+PageResult = Tuple[Optional[Dict[str, Any]], float]
+
+
+class Fetcher(abc.ABC):
+    """
+    Общий интерфейс загрузки страниц поиска hh.ru.
+
+    Бэкенд получает сразу список страниц и сам решает, загружать их по
+    очереди (requests), одновременно (async) или пулом браузеров (selenium).
+    Обход страниц, дедупликация и запись делаются одинаково для всех
+    бэкендов в collect(), поэтому бэкенды можно сравнивать на одной нагрузке
+    и заменять друг другом.
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def iter_pages(self, tasks: List[PageTask], per_page: int = 50,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[PageResult]:
+        """
+        Загружает страницы и выдает результаты в порядке tasks, каждый - как
+        только он готов, не дожидаясь остальных страниц.
+
+        Args:
+            tasks (List[PageTask]): Страницы (запрос, номер страницы).
+            per_page (int): Вакансий на странице.
+            date_from (Optional[Dict[str, str]]): Для запросов из словаря - только вакансии,
+                опубликованные начиная с указанного момента.
+            order_by (Optional[str]): Сортировка выдачи (напр., 'publication_time');
+                с date_from выдача всегда сортируется по дате публикации.
+        """
+
+    def fetch_pages(self, tasks: List[PageTask], per_page: int = 50,
+                    date_from: Optional[Dict[str, str]] = None,
+                    order_by: Optional[str] = None) -> List[PageResult]:
+        """Загружает страницы; результаты в порядке tasks."""
+        return list(self.iter_pages(tasks, per_page, date_from, order_by))
+
+    def close(self):
+        """Освобождает ресурсы бэкенда."""
+
+    def __enter__(self) -> 'Fetcher':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class RequestsFetcher(Fetcher):
+    """Последовательная загрузка через HHParser (requests.Session с адаптивным темпом)."""
+
+    name = 'requests'
+
+    def __init__(self, parser: Optional[HHParser] = None, only_with_salary: bool = False, area: int = 1):
+        self.parser = parser or HHParser()
+        self.only_with_salary = only_with_salary
+        self.area = area
+
+    def iter_pages(self, tasks: List[PageTask], per_page: int = 50,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[PageResult]:
+        date_from = date_from or {}
+        for query, page in tasks:
+            start = time.perf_counter()
+            data = self.parser.search_vacancies(query, area=self.area, per_page=per_page, page=page,
+                                                date_from=date_from.get(query),
+                                                only_with_salary=self.only_with_salary, order_by=order_by)
+            yield data, (time.perf_counter() - start) * 1000
+
+    def close(self):
+        self.parser.session.close()
+
+
+class AsyncFetcher(Fetcher):
+    """
+    Одновременная загрузка через AsyncHHParser (aiohttp, общий пул соединений).
+    Созданный здесь парсер закрывается в close(), переданный - нет.
+    """
+
+    name = 'async'
+
+    def __init__(self, parser=None, concurrency: int = 8, only_with_salary: bool = False):
+        # aiohttp нужен только этому бэкенду
+        from hh_async import AsyncHHParser
+        self._owned = parser is None
+        self.parser = parser or AsyncHHParser(concurrency=concurrency)
+        self.only_with_salary = only_with_salary
+
+    def iter_pages(self, tasks: List[PageTask], per_page: int = 50,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[PageResult]:
+        return self.parser.iter_pages(tasks, per_page=per_page, only_with_salary=self.only_with_salary,
+                                      date_from=date_from, order_by=order_by)
+
+    def close(self):
+        if self._owned:
+            self.parser.close()
+
+
+class SeleniumFetcher(Fetcher):
+    """
+    Загрузка браузером: HHAPISeleniumParser по одной странице с паузой, как в
+    исходном парсере, либо всеми браузерами BrowserPool. С hybrid=True браузер
+    только получает сессию, а страницы загружает HTTP-клиент (HybridHHParser).
+    Созданный здесь парсер закрывается в close(), переданный - нет.
+
+    Фиксированная пауза page_interval (по умолчанию 0.5 сек) нужна только
+    браузеру: темп HybridHHParser задает адаптивный ограничитель его
+    HTTP-клиента, поэтому для него пауза по умолчанию не добавляется.
+    """
+
+    name = 'selenium'
+
+    def __init__(self, parser=None, browsers: int = 1, hybrid: bool = False, only_with_salary: bool = False,
+                 page_interval: Optional[float] = None, **parser_options):
+        self._owned = parser is None
+        if parser is None:
+            # selenium нужен только этому бэкенду
+            if hybrid:
+                from hh_hybrid import HybridHHParser
+                parser = HybridHHParser(headless=True, **parser_options)
+            elif browsers > 1:
+                from browser_pool import BrowserPool
+                parser = BrowserPool(size=browsers, **parser_options).start()
+            else:
+                from hh_selenium import HHAPISeleniumParser
+                parser = HHAPISeleniumParser(headless=True, **parser_options)
+        if page_interval is None:
+            from hh_hybrid import HybridHHParser
+            page_interval = 0.0 if isinstance(parser, HybridHHParser) else 0.5
+        self.parser = parser
+        self.only_with_salary = only_with_salary
+        self.page_interval = page_interval
+        self._last_page_at = 0.0
+
+    def iter_pages(self, tasks: List[PageTask], per_page: int = 50,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[PageResult]:
+        date_from = date_from or {}
+        if hasattr(self.parser, 'iter_pages'):
+            yield from self.parser.iter_pages([(page, query) for query, page in tasks], per_page=per_page,
+                                              only_with_salary=self.only_with_salary, date_from=date_from,
+                                              order_by=order_by)
+            return
+
+        for query, page in tasks:
+            # Задержка для соблюдения лимитов API
+            delay = self._last_page_at + self.page_interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            start = time.perf_counter()
+            data = self.parser.get_vacancies_from_page(page, query, per_page=per_page,
+                                                       only_with_salary=self.only_with_salary,
+                                                       date_from=date_from.get(query), order_by=order_by)
+            self._last_page_at = time.perf_counter()
+            yield data, (self._last_page_at - start) * 1000
+
+    def close(self):
+        if self._owned:
+            self.parser.close()
+
+
+BACKENDS = ['requests', 'async', 'selenium', 'hybrid']
+
+
+def create_fetcher(backend: str, concurrency: int = 8, browsers: int = 1, **parser_options) -> Fetcher:
+    """
+    Создает бэкенд по имени: 'requests', 'async', 'selenium' (browsers > 1 - пул
+    браузеров) или 'hybrid' (браузер только получает сессию для HTTP-клиента).
+    parser_options передаются браузерному парсеру (fast_load, capture_network).
+    """
+    if backend == 'requests':
+        return RequestsFetcher()
+    if backend == 'async':
+        return AsyncFetcher(concurrency=concurrency)
+    if backend == 'selenium':
+        return SeleniumFetcher(browsers=browsers, **parser_options)
+    if backend == 'hybrid':
+        return SeleniumFetcher(hybrid=True, **parser_options)
+    raise ValueError(f"Неизвестный бэкенд: {backend}")
+
+
+def collect(fetcher: Fetcher, queries: List[str], pages: int = 3, per_page: int = 50,
+            seen_ids: Optional[SeenIds] = None, sink: Optional[NDJSONSink] = None,
+            tag_query: bool = False, date_from: Optional[str] = None,
+            marks: Optional[HighWaterMarks] = None) -> List[Dict[str, Any]]:
+    """
+    Обходит выдачу по всем запросам через любой бэкенд.
+
+    Первые страницы всех запросов загружаются одним пакетом и сообщают
+    количество страниц, остальные - вторым пакетом; вакансии идут в порядке
+    (запрос, страница). Обход запроса прерывается на первой неудачной странице.
+
+    Страницы второго пакета обрабатываются (и пишутся в sink) по мере
+    получения; до своей очереди в памяти ждут только первые страницы запросов.
+
+    Если seen_ids содержит id предыдущих запусков, обход запроса прекращается
+    на странице, все вакансии которой уже собраны ранее. Выдача тогда
+    запрашивается по дате публикации (от новых к старым), поэтому дальше
+    только известные вакансии; в порядке по релевантности такой остановки
+    не было бы. Страницы при этом загружаются
+    волнами (следующая страница всех продолжающихся запросов), чтобы не
+    загружать лишних страниц, и вакансии идут в порядке (страница, запрос).
+
+    Args:
+        fetcher (Fetcher): Бэкенд загрузки.
+        queries (List[str]): Запросы для поиска.
+        pages (int): Максимум страниц на запрос.
+        per_page (int): Вакансий на странице.
+        seen_ids (Optional[SeenIds]): Пропускать вакансии с уже встречавшимися id.
+        sink (Optional[NDJSONSink]): Записывать страницы сразу, не накапливая их в памяти.
+        tag_query (bool): Добавлять вакансиям поле 'search_query'.
+        date_from (Optional[str]): Только вакансии, опубликованные начиная с этого момента.
+        marks (Optional[HighWaterMarks]): Отметки инкрементального парсинга: отметка запроса
+            заменяет date_from, выдача запрашивается по дате публикации, а новая отметка
+            подтверждается, если обход запроса завершился без ошибки загрузки (в том
+            числе на ограничении pages). Сохраняет отметки вызывающий код.
+
+    Returns:
+        List[Dict[str, Any]]: Собранные вакансии (пустой список, если задан sink).
+    """
+    query_date_from = {}
+    for query in queries:
+        query_date_from[query] = (marks.get(query) if marks is not None else None) or date_from
+        if query_date_from[query]:
+            print(f"'{query}': вакансии, опубликованные с {query_date_from[query]}")
+    query_date_from = {query: value for query, value in query_date_from.items() if value}
+
+    all_vacancies = []
+    counts = {query: 0 for query in queries}
+
+    def finish(query: str):
+        # Обход запроса завершен без ошибок загрузки
+        if marks is not None:
+            marks.complete(query)
+
+    def take(query: str, page: int, data: Optional[Dict[str, Any]]) -> bool:
+        """Обрабатывает страницу запроса. Returns: продолжать ли обход запроса."""
+        if not data:
+            # None или {} - ошибка загрузки: отметка запроса не сдвигается
+            print(f"'{query}': нет данных на странице {page + 1}. Прерывание.")
+            return False
+        if not data.get('items'):
+            print(f"'{query}': на странице {page + 1} вакансий нет.")
+            finish(query)
+            return False
+
+        vacancies = data['items']
+        if marks is not None:
+            marks.observe(query, vacancies)
+
+        known_page = False
+        if early_stop:
+            known_page = all(seen_ids.known_before(vacancy['id']) for vacancy in vacancies)
+        if seen_ids is not None:
+            vacancies = [vacancy for vacancy in vacancies if seen_ids.add(vacancy['id'])]
+        if tag_query:
+            for vacancy in vacancies:
+                vacancy['search_query'] = query
+        if sink is not None:
+            sink.write(vacancies)
+        else:
+            all_vacancies.extend(vacancies)
+        counts[query] += len(vacancies)
+
+        if known_page:
+            print(f"'{query}': все вакансии страницы {page + 1} собраны ранее. Прерывание.")
+            finish(query)
+            return False
+        if page + 1 >= limits[query]:
+            # Последняя страница выдачи или ограничение pages
+            finish(query)
+            return False
+        return True
+
+    # Остановка на известной странице и отметки верны только для выдачи, отсортированной по дате
+    early_stop = seen_ids is not None and seen_ids.has_history
+    order_by = 'publication_time' if early_stop or marks is not None else None
+    limits: Dict[str, int] = {}
+
+    first_pages = [data for data, _ in fetcher.iter_pages([(query, 0) for query in queries], per_page,
+                                                          query_date_from, order_by)]
+    limits.update((query, min(pages, data.get('pages', 1)) if data and data.get('items') else 1)
+                  for query, data in zip(queries, first_pages))
+
+    if early_stop:
+        active = [query for query, data in zip(queries, first_pages) if take(query, 0, data)]
+        page = 1
+        while True:
+            active = [query for query in active if page < limits[query]]
+            if not active:
+                break
+            wave = fetcher.iter_pages([(query, page) for query in active], per_page, query_date_from, order_by)
+            active = [query for query, (data, _) in zip(active, wave) if take(query, page, data)]
+            page += 1
+    else:
+        tasks = [(query, page) for query in queries for page in range(1, limits[query])]
+        rest = fetcher.iter_pages(tasks, per_page, query_date_from, order_by)
+        try:
+            for query, data in zip(queries, first_pages):
+                # Страницы запроса идут в rest подряд и забираются, даже если обход запроса прерван
+                proceed = take(query, 0, data)
+                for page in range(1, limits[query]):
+                    data, _ = next(rest)
+                    proceed = proceed and take(query, page, data)
+        finally:
+            rest.close()
+
+    for query in queries:
+        print(f"'{query}': собрано вакансий: {counts[query]}")
+    print(f"Всего собрано вакансий: {sum(counts.values())}")
+    return all_vacancies
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Сбор вакансий hh.ru через выбранный бэкенд')
+    arg_parser.add_argument('--backend', choices=BACKENDS, default='requests')
+    arg_parser.add_argument('--pages', type=int, default=3, help='Страниц на запрос')
+    arg_parser.add_argument('--per-page', type=int, default=50)
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='async: одновременных запросов')
+    arg_parser.add_argument('--browsers', type=int, default=1, help='selenium: размер пула браузеров')
+    arg_parser.add_argument('--fast', action='store_true', help='selenium/hybrid: быстрая загрузка страниц')
+    arg_parser.add_argument('--ndjson', default=None, help='Писать вакансии в NDJSON с этим префиксом')
+    arg_parser.add_argument('--gzip', action='store_true', help='Сжимать файлы NDJSON')
+    arg_parser.add_argument('--output', default='programming_vacancies.json')
+    args = arg_parser.parse_args()
+
+    search_queries = [
+        "Data Scientist",
+        "ML Engineer",
+        "Системный аналитик",
+        "Программист",
+        "Разработчик"
+    ]
+
+    sink = NDJSONSink(args.ndjson, compress=args.gzip) if args.ndjson else None
+    start = time.perf_counter()
+    with create_fetcher(args.backend, concurrency=args.concurrency, browsers=args.browsers,
+                        fast_load=args.fast) as fetcher:
+        vacancies = collect(fetcher, search_queries, pages=args.pages, per_page=args.per_page,
+                            seen_ids=SeenIds(), sink=sink)
+    print(f"Бэкенд {args.backend}: {time.perf_counter() - start:.2f} сек")
+
+    if sink is not None:
+        sink.close()
+    else:
+        HHParser().save_to_json(vacancies, args.output)
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+
+from fetchers import AsyncFetcher, collect
+from hh_requests import HHParser, RETRY_STATUSES
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class AsyncHHParser:
+    """
+    Асинхронный парсер API HeadHunter: страницы всех запросов загружаются
+    одновременно через один пул keep-alive соединений.
+
+    Одновременных запросов не больше `concurrency`, а общий темп задает тот же
+    адаптивный ограничитель, что и у HHParser (429/503 и Retry-After учитываются
+    так же).
+
+    Сессия aiohttp создается при первой загрузке и живет до close(): все вызовы
+    fetch_pages используют один пул соединений в собственном цикле событий парсера.
+    """
+
+    def __init__(self, concurrency: int = 8, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 max_retries: int = 5):
+        self.base_url = "https://api.hh.ru/vacancies"
+        self.headers = dict(HHParser().headers)
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.max_retries = max_retries
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _run(self, awaitable):
+        # Сессия привязана к циклу событий, поэтому цикл тоже один на парсер
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(awaitable)
+
+    async def _open(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=30)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def search_vacancies(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                               text: str, area: int = 1, per_page: int = 100, page: int = 0,
+                               date_from: Optional[str] = None,
+                               only_with_salary: bool = True, order_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Асинхронный аналог HHParser.search_vacancies.
+
+        Returns:
+            Dict[str, Any]: JSON-ответ от API или None в случае ошибки.
+        """
+        params = {
+            'text': text,
+            'area': area,
+            'per_page': per_page,
+            'page': page,
+        }
+        if only_with_salary:
+            params['only_with_salary'] = 'true'
+        if date_from:
+            params['date_from'] = date_from
+        if order_by or date_from:
+            params['order_by'] = order_by or 'publication_time'
+
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self.rate_limiter.reserve())
+            async with semaphore:
+                try:
+                    async with session.get(self.base_url, params=params) as response:
+                        if response.status in RETRY_STATUSES:
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                            if response.status in (429, 503):
+                                self.rate_limiter.on_throttle(retry_after)
+                            delay = retry_after if retry_after is not None else self.rate_limiter.backoff(attempt)
+                            print(f"'{text}', страница {page + 1}: ответ {response.status}, "
+                                  f"повтор через {delay:.1f} сек")
+                        else:
+                            response.raise_for_status()
+                            data = await response.json()
+                            self.rate_limiter.on_success()
+                            return data
+                except (aiohttp.ClientResponseError, ValueError) as e:
+                    # ValueError - ответ не JSON или обрезан (JSONDecodeError, ContentTypeError)
+                    print(f"Ошибка при запросе: {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    delay = self.rate_limiter.backoff(attempt)
+                    print(f"Ошибка при запросе: {e}. Повтор через {delay:.1f} сек")
+            # Ожидание перед повтором не занимает слот семафора
+            await asyncio.sleep(delay)
+
+        print(f"Не удалось выполнить запрос после {self.max_retries} повторов")
+        return None
+
+    async def _fetch(self, query: str, page: int, per_page: int, only_with_salary: bool,
+                     date_from: Optional[str], order_by: Optional[str]) -> Tuple[Optional[Dict[str, Any]], float]:
+        start = time.perf_counter()
+        data = await self.search_vacancies(self._session, self._semaphore, query, per_page=per_page, page=page,
+                                           date_from=date_from, only_with_salary=only_with_salary,
+                                           order_by=order_by)
+        return data, (time.perf_counter() - start) * 1000
+
+    def iter_pages(self, tasks: List[Tuple[str, int]], per_page: int = 100, only_with_salary: bool = True,
+                   date_from: Optional[Dict[str, str]] = None,
+                   order_by: Optional[str] = None) -> Iterator[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Загружает страницы (запрос, номер) одновременно через пул соединений парсера
+        и выдает результаты в порядке tasks, каждый - как только он готов.
+        date_from задает по запросам момент публикации, начиная с которого нужны вакансии,
+        order_by - сортировку выдачи.
+
+        Пока вызывающий код обрабатывает выданную страницу, цикл событий стоит;
+        остальные загрузки продолжаются при получении следующего результата.
+        """
+        date_from = date_from or {}
+        self._run(self._open())
+        pending = [self._loop.create_task(self._fetch(query, page, per_page, only_with_salary, date_from.get(query),
+                                                       order_by))
+                   for query, page in tasks]
+        try:
+            for task in pending:
+                yield self._run(task)
+        finally:
+            # Обход прерван раньше: незавершенные загрузки отменяются
+            unfinished = [task for task in pending if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                self._run(asyncio.gather(*unfinished, return_exceptions=True))
+
+    def fetch_pages(self, tasks: List[Tuple[str, int]], per_page: int = 100, only_with_salary: bool = True,
+                    date_from: Optional[Dict[str, str]] = None, order_by: Optional[str] = None) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Загружает страницы (запрос, номер) одновременно через пул соединений парсера.
+
+        Returns:
+            List[Tuple[Optional[Dict[str, Any]], float]]: (JSON-ответ или None, время в мс)
+            в порядке tasks.
+        """
+        return list(self.iter_pages(tasks, per_page, only_with_salary, date_from, order_by))
+
+    def close(self):
+        """Закрывает сессию aiohttp и цикл событий парсера."""
+        if self._session is not None:
+            self._run(self._session.close())
+            self._session = None
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+    def __enter__(self) -> 'AsyncHHParser':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def parse_many(self, queries: List[str], pages: int = 3) -> List[Dict[str, Any]]:
+        """
+        Парсит страницы всех запросов одновременно.
+
+        Args:
+            queries (List[str]): Запросы для поиска.
+            pages (int): Количество страниц на запрос.
+
+        Returns:
+            List[Dict[str, Any]]: Вакансии в том же порядке, что и при последовательном
+            вызове HHParser.parse_vacancies для каждого запроса.
+        """
+        start = time.perf_counter()
+        vacancies = collect(AsyncFetcher(self, only_with_salary=True), queries, pages=pages, per_page=100)
+        print(f"Время сбора: {time.perf_counter() - start:.2f} сек")
+        return vacancies
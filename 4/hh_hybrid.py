@@ -0,0 +1,81 @@
+from typing import Any, Dict, Optional
+
+from hh_requests import HHParser
+from hh_selenium import HHAPISeleniumParser
+
+# Страница, на которой браузер получает cookies сессии hh.ru
+BOOTSTRAP_URL = "https://hh.ru/"
+
+
+class HybridHHParser(HHAPISeleniumParser):
+    """
+    Гибридный парсер: браузер только получает сессию (cookies и User-Agent),
+    а страницы API загружаются обычным HTTP-клиентом HHParser, что намного
+    быстрее полной отрисовки в Chrome.
+
+    Если HTTP-запрос не прошел (напр., сайт потребовал проверку браузера),
+    сессия обновляется через браузер и запрос повторяется; при повторной
+    неудаче страница загружается самим браузером. После max_http_failures
+    неудач подряд все страницы загружаются браузером.
+    """
+
+    def __init__(self, headless: bool = True, max_http_failures: int = 3, **parser_options):
+        super().__init__(headless=headless, **parser_options)
+        self.http = HHParser()
+        self.max_http_failures = max_http_failures
+        self.http_failures = 0
+        self.http_pages = 0
+        self.browser_pages = 0
+        self.bootstrap()
+
+    def bootstrap(self):
+        """Открывает hh.ru в браузере и передает cookies и User-Agent HTTP-клиенту."""
+        self.driver.get(BOOTSTRAP_URL)
+        user_agent = self.driver.execute_script("return navigator.userAgent")
+        self.http.session.headers['User-Agent'] = user_agent
+        for cookie in self.driver.get_cookies():
+            self.http.session.cookies.set(cookie['name'], cookie['value'],
+                                          domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        print(f"Сессия браузера передана HTTP-клиенту: {len(self.driver.get_cookies())} cookies")
+
+    def _get_over_http(self, page: int, search_text: str, per_page: int,
+                       only_with_salary: bool, date_from: Optional[str],
+                       order_by: Optional[str]) -> Optional[Dict[str, Any]]:
+        # Те же параметры, что и у запроса через браузер
+        return self.http.search_vacancies(search_text, area=1, per_page=per_page, page=page,
+                                          date_from=date_from, only_with_salary=only_with_salary,
+                                          order_by=order_by)
+
+    def get_vacancies_from_page(self, page: int, search_text: str = "программист", per_page: int = 50,
+                                only_with_salary: bool = False, date_from: Optional[str] = None,
+                                order_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Получает вакансии со страницы через HTTP-клиент, а при неудаче - через браузер.
+        """
+        if self.http_failures < self.max_http_failures:
+            data = self._get_over_http(page, search_text, per_page, only_with_salary, date_from, order_by)
+            if data is None:
+                print("HTTP-запрос не прошел, обновление сессии через браузер...")
+                self.bootstrap()
+                data = self._get_over_http(page, search_text, per_page, only_with_salary, date_from, order_by)
+
+            if data is not None:
+                self.http_failures = 0
+                self.http_pages += 1
+                return data
+
+            self.http_failures += 1
+            if self.http_failures >= self.max_http_failures:
+                print("HTTP-клиент не проходит проверку, дальше страницы загружает браузер")
+
+        self.browser_pages += 1
+        # Страницы через браузер идут в том же темпе, что и через HTTP-клиент
+        self.http.rate_limiter.wait()
+        return super().get_vacancies_from_page(page, search_text, per_page, only_with_salary, date_from,
+                                               order_by)
+
+    def close(self):
+        """Закрытие драйвера и HTTP-сессии."""
+        print(f"Страниц через HTTP: {self.http_pages}, через браузер: {self.browser_pages}")
+        self.http.session.close()
+        super().close()
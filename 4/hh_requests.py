@@ -1,30 +1,57 @@
 import requests
 import time
 import json
+import os
+import argparse
+import sys
 from typing import Dict, List, Any, Optional
 
+# Отметки инкрементального парсинга общие с краулером из папки 3
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, '3'))
+from crawl_state import HighWaterMarks
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from seen_ids import SeenIds
+from sinks import NDJSONSink
+
+# Ответы, после которых запрос повторяется с ожиданием
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 class HHParser:
     """
     Парсер для API HeadHunter для поиска вакансий, связанных с программированием.
     """
     
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None, max_retries: int = 5):
         self.base_url = "https://api.hh.ru/vacancies"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Общий для всех запросов парсера темп: растет, пока API не ответит 429/503
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.max_retries = max_retries
 
-    def search_vacancies(self, text: str, area: int = 1, per_page: int = 100, page: int = 0) -> Optional[Dict[str, Any]]:
+    def search_vacancies(self, text: str, area: int = 1, per_page: int = 100, page: int = 0,
+                         date_from: Optional[str] = None,
+                         only_with_salary: bool = True,
+                         order_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Поиск вакансий по текстовому запросу.
         
+        Темп запросов задает self.rate_limiter. На 429/503 запрос повторяется
+        после Retry-After (или экспоненциальной задержки со случайным разбросом),
+        на ошибки соединения и 5xx - после экспоненциальной задержки;
+        не более self.max_retries повторов.
+        
         Args:
             text (str): Текст для поиска (напр., "Python разработчик").
             area (int): ID региона (1 - Москва, 2 - СПб, 113 - Россия).
             per_page (int): Количество вакансий на странице (макс. 100).
             page (int): Номер страницы (начинается с 0).
+            date_from (Optional[str]): Только вакансии, опубликованные начиная с этого момента.
+            only_with_salary (bool): Только вакансии с указанной зарплатой.
+            order_by (Optional[str]): Сортировка выдачи (с date_from по умолчанию 'publication_time').
             
         Returns:
             Dict[str, Any]: JSON-ответ от API или None в случае ошибки.
@@ -34,54 +61,106 @@ class HHParser:
             'area': area,
             'per_page': per_page,
             'page': page,
-            'only_with_salary': True  # Опционально: только вакансии с указанной зарплатой
         }
+        if only_with_salary:
+            params['only_with_salary'] = True
+        if date_from:
+            params['date_from'] = date_from
+        if order_by or date_from:
+            params['order_by'] = order_by or 'publication_time'
         
-        try:
-            response = self.session.get(self.base_url, params=params)
-            response.raise_for_status()  # Проверка на HTTP ошибки
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Ошибка при запросе: {e}")
-            return None
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.session.get(self.base_url, params=params)
+            except requests.exceptions.RequestException as e:
+                delay = self.rate_limiter.backoff(attempt)
+                print(f"Ошибка при запросе: {e}. Повтор через {delay:.1f} сек")
+                time.sleep(delay)
+                continue
+            
+            if response.status_code in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code in (429, 503):
+                    self.rate_limiter.on_throttle(retry_after)
+                delay = retry_after if retry_after is not None else self.rate_limiter.backoff(attempt)
+                print(f"Ответ {response.status_code}, повтор через {delay:.1f} сек "
+                      f"(темп {self.rate_limiter.rate:.2f} запр./сек)")
+                time.sleep(delay)
+                continue
+            
+            try:
+                response.raise_for_status()  # Проверка на HTTP ошибки
+                data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Ошибка при запросе: {e}")
+                return None
+            self.rate_limiter.on_success()
+            return data
+        
+        print(f"Не удалось выполнить запрос после {self.max_retries} повторов")
+        return None
 
-    def parse_vacancies(self, search_query: str, pages_to_parse: int = 5) -> List[Dict[str, Any]]:
+    def parse_vacancies(self, search_query: str, pages_to_parse: int = 5,
+                        date_from: Optional[str] = None,
+                        seen_ids: Optional[SeenIds] = None,
+                        sink: Optional[NDJSONSink] = None,
+                        marks: Optional[HighWaterMarks] = None) -> List[Dict[str, Any]]:
         """
         Парсит несколько страниц с вакансиями.
+        Если передан sink, каждая страница записывается в него сразу после получения.
+        
+        Если передан seen_ids, возвращаются только вакансии с еще не встречавшимися
+        id (между запросами и запусками), а парсинг запроса прекращается на
+        странице, все вакансии которой известны с предыдущих запусков (выдача
+        тогда запрашивается по дате публикации). Обход выполняет fetchers.collect, общий для всех бэкендов загрузки.
         
         Args:
             search_query (str): Запрос для поиска.
             pages_to_parse (int): Количество страниц для парсинга.
+            date_from (Optional[str]): Только вакансии, опубликованные начиная с этого момента.
+            seen_ids (Optional[SeenIds]): Множество уже собранных id вакансий.
+            sink (Optional[NDJSONSink]): Потоковая запись вакансий.
+            marks (Optional[HighWaterMarks]): Отметки инкрементального парсинга; отметка
+                запроса сдвигается, только если обход завершился без ошибки загрузки.
             
         Returns:
-            List[Dict[str, Any]]: Список спарсенных вакансий.
+            List[Dict[str, Any]]: Список спарсенных вакансий (пустой, если задан sink).
         """
-        all_vacancies = []
+        # fetchers импортирует этот модуль
+        from fetchers import RequestsFetcher, collect
+        return collect(RequestsFetcher(self, only_with_salary=True), [search_query], pages=pages_to_parse,
+                       per_page=100, seen_ids=seen_ids, sink=sink, date_from=date_from, marks=marks)
+
+    def parse_new_vacancies(self, search_query: str, pages_to_parse: int = 20,
+                            state_file: str = "hh_crawl_state.json",
+                            seen_ids: Optional[SeenIds] = None,
+                            sink: Optional[NDJSONSink] = None) -> List[Dict[str, Any]]:
+        """
+        Инкрементальный парсинг: только вакансии, опубликованные после предыдущего запуска.
         
-        for page in range(pages_to_parse):
-            print(f"Парсинг страницы {page + 1}...")
-            
-            data = self.search_vacancies(search_query, page=page)
-            
-            if data is None:
-                print(f"Не удалось получить данные для страницы {page}. Прерывание.")
-                break
-                
-            vacancies = data.get('items', [])
-            if not vacancies:
-                print("Больше вакансий нет. Прерывание.")
-                break
-                
-            all_vacancies.extend(vacancies)
-            
-            if page >= data['pages'] - 1:
-                break
-                
-            # Уважаем API и добавляем задержку
-            time.sleep(0.5)
+        Отметка (максимальный published_at по запросу) хранится в state_file
+        и передается в API как date_from, поэтому повторный запуск стоит
+        несколько запросов вместо полного обхода выдачи. Выдача запрашивается по
+        дате публикации; если обход прервался из-за ошибки загрузки, отметка не
+        сдвигается (ограничение pages_to_parse ошибкой не считается).
+        
+        Args:
+            search_query (str): Запрос для поиска.
+            pages_to_parse (int): Максимальное количество страниц для парсинга.
+            state_file (str): Файл с отметками по запросам.
+            seen_ids (Optional[SeenIds]): Множество уже собранных id вакансий.
+            sink (Optional[NDJSONSink]): Потоковая запись вакансий.
             
-        print(f"Всего спарсено вакансий: {len(all_vacancies)}")
-        return all_vacancies
+        Returns:
+            List[Dict[str, Any]]: Список новых вакансий (пустой, если задан sink).
+        """
+        marks = HighWaterMarks(state_file)
+        vacancies = self.parse_vacancies(search_query, pages_to_parse=pages_to_parse, seen_ids=seen_ids,
+                                         sink=sink, marks=marks)
+        marks.save()
+        
+        return vacancies
 
     def save_to_json(self, data: List[Dict[str, Any]], filename: str = "hh_vacancies.json"):
         """Сохраняет данные в JSON файл."""
@@ -89,7 +168,36 @@ class HHParser:
             json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"Данные сохранены в {filename}")
 
+    def merge_into_json(self, data: List[Dict[str, Any]], filename: str = "hh_vacancies.json"):
+        """
+        Дописывает вакансии в существующий JSON файл.
+        Вакансии с уже известным id заменяются более свежей версией.
+        """
+        existing = []
+        if os.path.isfile(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        
+        merged = {vacancy['id']: vacancy for vacancy in existing}
+        added = sum(1 for vacancy in data if vacancy['id'] not in merged)
+        merged.update((vacancy['id'], vacancy) for vacancy in data)
+        
+        self.save_to_json(list(merged.values()), filename)
+        print(f"Новых вакансий: {added}, всего в файле: {len(merged)}")
+
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Парсинг вакансий hh.ru через API')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='Собирать только новые вакансии и дописывать их в programming_vacancies.json')
+    arg_parser.add_argument('--async', dest='use_async', action='store_true',
+                            help='Загружать страницы всех запросов одновременно (aiohttp)')
+    arg_parser.add_argument('--concurrency', type=int, default=8,
+                            help='Максимум одновременных запросов в режиме --async')
+    arg_parser.add_argument('--ndjson', default=None,
+                            help='Писать вакансии постранично в NDJSON с этим префиксом вместо programming_vacancies.json')
+    arg_parser.add_argument('--gzip', action='store_true', help='Сжимать файлы NDJSON')
+    args = arg_parser.parse_args()
+    
     parser = HHParser()
     
     search_queries = [
@@ -100,11 +208,39 @@ if __name__ == "__main__":
         "Разработчик"
     ]
     
-    all_vacancies_data = []
+    # Id собранных вакансий: в инкрементальном режиме сохраняются между запусками,
+    # иначе убирают только пересечения запросов текущего запуска
+    seen_ids = SeenIds("hh_seen_ids.bin" if args.incremental else None)
+    # Отметки date_from по запросам: повторный запуск загружает только новые публикации
+    marks = HighWaterMarks("hh_crawl_state.json") if args.incremental else None
+    # С NDJSON вакансии пишутся на диск постранично и не накапливаются в памяти
+    sink = NDJSONSink(args.ndjson, compress=args.gzip) if args.ndjson else None
+    
+    # fetchers импортирует этот модуль, поэтому импортируется только при запуске
+    from fetchers import AsyncFetcher, RequestsFetcher, collect
+    if args.use_async:
+        fetcher = AsyncFetcher(concurrency=args.concurrency, only_with_salary=True)
+    else:
+        fetcher = RequestsFetcher(parser, only_with_salary=True)
+    
+    try:
+        # С sink каждая страница пишется сразу, а не после обхода всех запросов
+        all_vacancies_data = collect(fetcher, search_queries, pages=20 if args.incremental else 3, per_page=100,
+                                     seen_ids=seen_ids, sink=sink, marks=marks)
+    finally:
+        fetcher.close()
+        # Даже при сбое обхода записанные страницы публикуются из .part
+        if sink is not None:
+            sink.close()
     
-    for query in search_queries:
-        print(f"\n=== Поиск вакансий для: '{query}' ===")
-        vacancies = parser.parse_vacancies(search_query=query, pages_to_parse=3)
-        all_vacancies_data.extend(vacancies)
+    collected = sink.records if sink is not None else len(all_vacancies_data)
+    print(f"\nУникальных вакансий: {collected}")
+    seen_ids.save()
+    if marks is not None:
+        marks.save()
     
-    parser.save_to_json(all_vacancies_data, "programming_vacancies.json")
+    if sink is None:
+        if args.incremental:
+            parser.merge_into_json(all_vacancies_data, "programming_vacancies.json")
+        else:
+            parser.save_to_json(all_vacancies_data, "programming_vacancies.json")
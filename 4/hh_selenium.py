@@ -11,19 +11,77 @@ import json
 import pandas as pd
 import random
 import logging
+import argparse
+import os
+import threading
+from urllib.parse import quote
 from typing import List, Dict, Any, Optional
 
+from fetchers import SeleniumFetcher, collect
+from sinks import NDJSONSink
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Кэш пути к chromedriver: повторные запуски не обращаются к сети за версией драйвера
+DRIVER_CACHE_FILE = "chromedriver_path.json"
+# Браузеры одного процесса не устанавливают драйвер одновременно
+_driver_lock = threading.Lock()
+
+
+def cached_driver_path(cache_file: str = DRIVER_CACHE_FILE) -> str:
+    """
+    Путь к chromedriver. ChromeDriverManager вызывается только при первом
+    запуске (или если сохраненный файл драйвера пропал), дальше путь берется
+    из cache_file, и браузеры запускаются без сети.
+    """
+    with _driver_lock:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                path = json.load(f).get('path')
+            if path and os.path.isfile(path):
+                return path
+        except (OSError, ValueError):
+            # Нет кэша или он поврежден: драйвер определяется заново
+            pass
+        
+        path = ChromeDriverManager().install()
+        # Атомарная запись: другой процесс не прочитает наполовину записанный файл
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': path}, f)
+        os.replace(tmp_file, cache_file)
+        return path
+
+
+# Ресурсы, которые не нужны для чтения JSON и блокируются в быстром режиме
+BLOCKED_RESOURCES = ["*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+                     "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"]
+
+
 class HHAPISeleniumParser:
     """
     Парсер HH.ru через API с использованием Selenium (рабочий пример из книги).
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, fast_load: bool = False, capture_network: bool = False,
+                 page_timeout: float = 15, driver_path: Optional[str] = None):
+        """
+        Args:
+            headless (bool): Запуск браузера без окна.
+            fast_load (bool): Быстрый режим: стратегия загрузки 'eager', блокировка
+                картинок, шрифтов и CSS, ожидание элемента <pre> вместо фиксированной паузы.
+            capture_network (bool): Брать тело JSON-ответа из сетевых событий DevTools,
+                а не из отрисованного текста страницы.
+            page_timeout (float): Максимальное ожидание страницы в быстром режиме, сек.
+            driver_path (Optional[str]): Путь к chromedriver (по умолчанию cached_driver_path()).
+        """
         self.driver = None
+        self.fast_load = fast_load
+        self.capture_network = capture_network
+        self.page_timeout = page_timeout
+        self.driver_path = driver_path
         self.setup_driver(headless)
     
     def setup_driver(self, headless: bool):
@@ -36,64 +94,88 @@ class HHAPISeleniumParser:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         
-        service = Service(ChromeDriverManager().install())
+        if self.fast_load:
+            # Не ждать загрузки подресурсов: для JSON достаточно готового DOM
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.fonts': 2,
+            })
+        if self.capture_network:
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
+        service = Service(self.driver_path or cached_driver_path())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        if self.fast_load or self.capture_network:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+        if self.fast_load:
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCES})
+            self.driver.set_page_load_timeout(self.page_timeout)
     
-    def get_vacancies_from_page(self, page: int, search_text: str = "программист") -> Dict[str, Any]:
+    def _captured_json(self, url: str) -> Optional[Dict[str, Any]]:
+        """Тело ответа на url из сетевых событий DevTools (None, если ответ не найден)."""
+        request_id = None
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if (message.get('method') == 'Network.responseReceived' and
+                    message['params']['response']['url'].startswith(url.split('?')[0])):
+                request_id = message['params']['requestId']
+        if request_id is None:
+            return None
+        body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        return json.loads(body['body'])
+    
+    def get_vacancies_from_page(self, page: int, search_text: str = "программист", per_page: int = 50,
+                                only_with_salary: bool = False, date_from: Optional[str] = None,
+                                order_by: Optional[str] = None) -> Dict[str, Any]:
         """
         Получает вакансии с указанной страницы через API.
+        
+        В быстром режиме страница читается, как только появился элемент <pre>,
+        а с capture_network JSON берется из ответа сервера через DevTools.
         """
-        url = f'https://api.hh.ru/vacancies?text={search_text}&area=1&per_page=50&page={page}'
+        url = f'https://api.hh.ru/vacancies?text={search_text}&area=1&per_page={per_page}&page={page}'
+        if only_with_salary:
+            url += '&only_with_salary=true'
+        if date_from:
+            # В отметке времени есть '+' часового пояса
+            url += f'&date_from={quote(date_from)}'
+        if order_by or date_from:
+            url += f'&order_by={order_by or "publication_time"}'
         print(f"Загружаем страницу {page}: {url}")
         
-        self.driver.get(url)
-        time.sleep(2)  # Небольшая задержка для стабильности
-        
         try:
-            content = self.driver.find_element(By.TAG_NAME, "pre").text
+            self.driver.get(url)
+            
+            if self.capture_network:
+                data = self._captured_json(url)
+                if data is not None:
+                    return data
+            
+            if self.fast_load:
+                pre = WebDriverWait(self.driver, self.page_timeout).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "pre")))
+            else:
+                time.sleep(2)  # Небольшая задержка для стабильности
+                pre = self.driver.find_element(By.TAG_NAME, "pre")
+            
+            content = pre.text
             data = json.loads(content)
             return data
         except Exception as e:
             print(f"Ошибка при получении данных со страницы {page}: {e}")
             return {}
     
-    def search_vacancies(self, search_queries: List[str], pages_per_query: int = 5) -> List[Dict[str, Any]]:
+    def search_vacancies(self, search_queries: List[str], pages_per_query: int = 5,
+                         sink: Optional[NDJSONSink] = None) -> List[Dict[str, Any]]:
         """
         Поиск вакансий по нескольким запросам.
+        Если передан sink, каждая страница сразу записывается в него и не
+        накапливается в памяти (возвращаемый список тогда пуст).
         """
-        all_vacancies = []
-        
-        for query in search_queries:
-            print(f"\n=== Поиск вакансий: '{query}' ===")
-            
-            for page in range(pages_per_query):
-                print(f"Страница {page + 1}...")
-                
-                data = self.get_vacancies_from_page(page, query)
-                
-                if not data or 'items' not in data:
-                    print(f"Нет данных на странице {page}. Прерывание.")
-                    break
-                
-                vacancies = data['items']
-                if not vacancies:
-                    print("Больше вакансий нет. Прерывание.")
-                    break
-                
-                for vacancy in vacancies:
-                    vacancy['search_query'] = query
-                
-                all_vacancies.extend(vacancies)
-                print(f"Добавлено вакансий: {len(vacancies)}")
-                
-                if page >= data.get('pages', 1) - 1:
-                    break
-                
-                # Задержка для соблюдения лимитов API
-                time.sleep(0.5)
-        
-        print(f"\nВсего собрано вакансий: {len(all_vacancies)}")
-        return all_vacancies
+        return collect(SeleniumFetcher(self), search_queries, pages=pages_per_query, per_page=50,
+                       sink=sink, tag_query=True)
     
     def close(self):
         """Закрытие драйвера."""
@@ -108,9 +190,32 @@ class HHAPISeleniumParser:
 
 def main():
     """Основная функция для запуска Selenium парсера."""
+    arg_parser = argparse.ArgumentParser(description='Парсинг вакансий hh.ru через API с помощью Selenium')
+    arg_parser.add_argument('--ndjson', default=None,
+                            help='Писать вакансии постранично в NDJSON с этим префиксом вместо hh_api_vacancies.json')
+    arg_parser.add_argument('--gzip', action='store_true', help='Сжимать файлы NDJSON')
+    arg_parser.add_argument('--browsers', type=int, default=1,
+                            help='Количество браузеров: больше 1 - страницы загружает пул браузеров')
+    arg_parser.add_argument('--fast', action='store_true',
+                            help='Быстрая загрузка: eager, без картинок/шрифтов/CSS, ожидание <pre> вместо паузы')
+    arg_parser.add_argument('--capture-network', action='store_true',
+                            help='Читать JSON из сетевых событий DevTools')
+    arg_parser.add_argument('--hybrid', action='store_true',
+                            help='Браузер только получает сессию, страницы загружаются HTTP-клиентом')
+    args = arg_parser.parse_args()
+    
     print("Запуск Selenium парсера hh.ru...")
     
-    parser = HHAPISeleniumParser(headless=True)
+    parser_options = {'fast_load': args.fast, 'capture_network': args.capture_network}
+    if args.hybrid:
+        from hh_hybrid import HybridHHParser
+        parser = HybridHHParser(headless=True, **parser_options)
+    elif args.browsers > 1:
+        from browser_pool import BrowserPool
+        parser = BrowserPool(size=args.browsers, **parser_options).start()
+    else:
+        parser = HHAPISeleniumParser(headless=True, **parser_options)
+    sink = NDJSONSink(args.ndjson, compress=args.gzip) if args.ndjson else None
     
     try:
         search_queries = [
@@ -121,16 +226,18 @@ def main():
         "Разработчик"
     ]
         
-        all_vacancies = parser.search_vacancies(search_queries, pages_per_query=3)
+        all_vacancies = parser.search_vacancies(search_queries, pages_per_query=3, sink=sink)
         
         # Сохраняем сырые данные
-        parser.save_to_json(all_vacancies, "hh_api_vacancies.json")
-        
-        print(f"\nУспешно собрано вакансий: {len(all_vacancies)}")
+        if sink is None:
+            parser.save_to_json(all_vacancies, "hh_api_vacancies.json")
+            print(f"\nУспешно собрано вакансий: {len(all_vacancies)}")
         
     except Exception as e:
         print(f"Ошибка: {e}")
     finally:
+        if sink is not None:
+            sink.close()
         parser.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    Адаптивный ограничитель частоты запросов (AIMD).
+
+    Каждый успешный ответ увеличивает допустимую частоту на `increase`
+    запросов в секунду (аддитивный рост), а ответ 429/503 уменьшает ее в
+    `decrease` раз (мультипликативное снижение) и приостанавливает все запросы
+    на время из Retry-After. Так частота держится около максимальной, которую
+    API выдерживает без блокировок.
+
+    Ограничитель не блокирует сам: reserve() возвращает задержку до
+    следующего разрешенного запроса, поэтому его можно разделять как между
+    потоками (wait), так и между корутинами (asyncio.sleep(reserve())).
+    """
+
+    def __init__(self, rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 increase: float = 0.1, decrease: float = 0.5,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+        self._blocked_until = 0.0
+
+    def reserve(self) -> float:
+        """Занимает слот для следующего запроса и возвращает, сколько секунд до него ждать."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time, self._blocked_until)
+            self._next_time = start + 1.0 / self.rate
+            return start - now
+
+    def wait(self):
+        """Блокирует поток до момента, когда можно выполнить следующий запрос."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self):
+        """Аддитивно увеличивает частоту после успешного ответа."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Мультипликативно снижает частоту после 429/503.
+        Если API указал Retry-After, все запросы приостанавливаются на это время.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.throttled += 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед повтором: экспоненциальная с полным случайным разбросом (full jitter)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает заголовок Retry-After: число секунд или HTTP-дата. None, если заголовка нет."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
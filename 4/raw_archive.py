@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sinks import iter_vacancies
+
+# Максимальный размер словаря zlib
+ZDICT_SIZE = 32768
+
+
+class RawArchive:
+    """
+    Архив сырых JSON-ответов hh.ru, сжатых блоками с общим словарем.
+
+    Вакансии пишутся компактным JSON по строке на запись и группируются
+    в блоки по block_records записей. Каждый блок сжимается zlib отдельно с
+    общим предустановленным словарем (zdict), собранным из образцов записей:
+    повторяющиеся ключи ответов API сжимаются даже в маленьких блоках.
+
+    Индекс id -> (смещение блока, длина блока, номер записи в блоке) позволяет
+    прочитать любую вакансию, распаковав только ее блок, а последовательный
+    обход читает блоки подряд.
+
+    Файлы архива: '<path>.data' (блоки), '<path>.zdict' (словарь),
+    '<path>.index.json' (индекс).
+    """
+
+    def __init__(self, path: str, block_records: int = 16):
+        self.path = path
+        self.block_records = block_records
+        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self.zdict = b''
+        self._pending: List[Tuple[str, bytes]] = []
+
+        if os.path.isfile(self.path + '.index.json'):
+            with open(self.path + '.index.json', 'r', encoding='utf-8') as f:
+                self.index = {key: tuple(value) for key, value in json.load(f).items()}
+        if os.path.isfile(self.path + '.zdict'):
+            with open(self.path + '.zdict', 'rb') as f:
+                self.zdict = f.read()
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def build_dictionary(samples: Iterable[Dict[str, Any]], size: int = ZDICT_SIZE) -> bytes:
+        """
+        Словарь zlib из образцов записей: их начало до size байт.
+        zlib лучше использует конец словаря, поэтому первые образцы ставятся в конец.
+        """
+        parts, total = [], 0
+        for sample in samples:
+            encoded = RawArchive._encode(sample)
+            parts.append(encoded)
+            total += len(encoded)
+            if total >= size:
+                break
+        return b''.join(reversed(parts))[-size:]
+
+    def set_dictionary(self, zdict: bytes):
+        """Задает словарь для нового архива (до первой записи)."""
+        if self.index:
+            raise ValueError("Словарь нельзя менять в непустом архиве")
+        self.zdict = zdict
+        with open(self.path + '.zdict', 'wb') as f:
+            f.write(zdict)
+
+    def _compressor(self):
+        return zlib.compressobj(level=9, zdict=self.zdict) if self.zdict else zlib.compressobj(level=9)
+
+    def _decompress(self, block: bytes) -> bytes:
+        decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+        return decompressor.decompress(block) + decompressor.flush()
+
+    def add(self, vacancy_id: str, record: Dict[str, Any]):
+        """Добавляет запись (запись с тем же id заменяет прежнюю)."""
+        self._pending.append((str(vacancy_id), self._encode(record)))
+        if len(self._pending) >= self.block_records:
+            self.flush()
+
+    def flush(self):
+        """Сжимает накопленные записи в блок и дописывает его в архив."""
+        if not self._pending:
+            return
+        compressor = self._compressor()
+        block = compressor.compress(b'\n'.join(data for _, data in self._pending)) + compressor.flush()
+        with open(self.path + '.data', 'ab') as f:
+            offset = f.tell()
+            f.write(block)
+        for position, (vacancy_id, _) in enumerate(self._pending):
+            self.index[vacancy_id] = (offset, len(block), position)
+        self._pending = []
+
+    def close(self):
+        """Записывает последний блок и атомарно сохраняет индекс."""
+        self.flush()
+        tmp_name = self.path + '.index.json.tmp'
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_name, self.path + '.index.json')
+
+    def __enter__(self) -> 'RawArchive':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, vacancy_id) -> bool:
+        return str(vacancy_id) in self.index
+
+    def get(self, vacancy_id) -> Optional[Dict[str, Any]]:
+        """Читает одну вакансию, распаковывая только ее блок. None, если id нет в архиве."""
+        location = self.index.get(str(vacancy_id))
+        if location is None:
+            return None
+        offset, length, position = location
+        with open(self.path + '.data', 'rb') as f:
+            f.seek(offset)
+            block = self._decompress(f.read(length))
+        return json.loads(block.split(b'\n')[position])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Последовательный обход актуальных записей в порядке блоков на диске."""
+        live = {(offset, position) for offset, _, position in self.index.values()}
+        if not os.path.isfile(self.path + '.data'):
+            return
+        with open(self.path + '.data', 'rb') as f:
+            for offset, length in sorted({(offset, length) for offset, length, _ in self.index.values()}):
+                f.seek(offset)
+                for position, line in enumerate(self._decompress(f.read(length)).split(b'\n')):
+                    # Записи, замененные более поздними версиями, пропускаются
+                    if (offset, position) in live:
+                        yield json.loads(line)
+
+
+def pack(archive: RawArchive, records: Iterable[Dict[str, Any]], dictionary_samples: int = 200) -> int:
+    """
+    Упаковывает вакансии в архив. Для нового архива словарь собирается
+    из первых dictionary_samples записей.
+
+    Returns:
+        int: Количество упакованных записей.
+    """
+    records = iter(records)
+    head = []
+    if not archive.zdict and not len(archive):
+        for record in records:
+            head.append(record)
+            if len(head) >= dictionary_samples:
+                break
+        archive.set_dictionary(RawArchive.build_dictionary(head))
+
+    count = 0
+    for record in head:
+        archive.add(record['id'], record)
+        count += 1
+    for record in records:
+        archive.add(record['id'], record)
+        count += 1
+    archive.close()
+    return count
+
+
+def iter_vacancy_folder(folder: str) -> Iterator[Dict[str, Any]]:
+    """Вакансии из папки с файлами <id>.json (как сохраняет 3/3.1.py)."""
+    for name in sorted(os.listdir(folder)):
+        if name.endswith('.json'):
+            with open(os.path.join(folder, name), 'r', encoding='utf-8') as f:
+                yield json.load(f)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Сжатый архив сырых ответов hh.ru с доступом по id')
+    arg_parser.add_argument('command', choices=['pack', 'get', 'stats'])
+    arg_parser.add_argument('--archive', default='raw_vacancies', help='Префикс файлов архива')
+    arg_parser.add_argument('--source', default='programming_vacancies.json',
+                            help='pack: папка с <id>.json, JSON-массив или NDJSON (файл или префикс)')
+    arg_parser.add_argument('--id', default=None, help='get: id вакансии')
+    arg_parser.add_argument('--block-records', type=int, default=16, help='Записей в одном сжатом блоке')
+    args = arg_parser.parse_args()
+
+    archive = RawArchive(args.archive, block_records=args.block_records)
+    if args.command == 'pack':
+        source = iter_vacancy_folder(args.source) if os.path.isdir(args.source) else iter_vacancies(args.source)
+        start = time.perf_counter()
+        packed = pack(archive, source)
+        print(f"Упаковано вакансий: {packed} за {time.perf_counter() - start:.2f} сек, всего в архиве: {len(archive)}")
+    elif args.command == 'get':
+        start = time.perf_counter()
+        record = archive.get(args.id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(json.dumps(record, ensure_ascii=False, indent=2) if record is not None else "Вакансия не найдена")
+        print(f"Время чтения: {elapsed_ms:.2f} мс")
+    else:
+        raw_size = 0
+        start = time.perf_counter()
+        for record in archive:
+            raw_size += len(RawArchive._encode(record))
+        elapsed = time.perf_counter() - start
+        data_size = os.path.getsize(args.archive + '.data') if os.path.isfile(args.archive + '.data') else 0
+        print(f"Вакансий: {len(archive)}, компактный JSON: {raw_size / 1e6:.2f} МБ, "
+              f"архив: {data_size / 1e6:.2f} МБ (x{raw_size / max(data_size, 1):.1f})")
+        print(f"Последовательный обход: {elapsed:.2f} сек")
@@ -1,11 +1,10 @@
-import time
 import matplotlib.pyplot as plt
 import pandas as pd
-import psutil
 import os
-import json
-from hh_requests import HHParser
-import threading
+from fetch_benchmark import plot_benchmark, run_benchmark
+from fetchers import RequestsFetcher
+from sinks import iter_vacancies
+import argparse
 
 def create_directories():
     """Создает директории для графиков."""
@@ -18,108 +17,15 @@ def create_directories():
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
-def get_memory_usage():
-    """Получает использование памяти текущим процессом в МБ"""
-    process = psutil.Process(os.getpid())
-    return process.memory_info().rss / 1024 / 1024 
-
 def load_testing():
     """
     Нагрузочное тестирование: измерение времени ответа, RPS и использования памяти.
     """
-    parser = HHParser()
-    requests_count = [5, 10, 20, 30, 50]
+    with RequestsFetcher() as fetcher:
+        df_metrics = run_benchmark(fetcher)
     
-    # Метрики для хранения результатов
-    avg_response_times = []  # Среднее время ответа в мс
-    rps_list = []            # Запросов в секунду
-    memory_usage_list = []   # Использование памяти в МБ
-    detailed_metrics = []    # Детальные метрики для каждого теста
+    plot_benchmark(df_metrics, 'graphs/load_testing', 'API HH.ru')
     
-    for count in requests_count:
-        print(f"\n--- Тест с {count} запросами ---")
-        
-        start_time = time.time()
-        start_memory = get_memory_usage()
-        response_times = []
-        successful_requests = 0
-        
-        for i in range(count):
-            request_start = time.time()
-            
-            data = parser.search_vacancies("Python", page=0)
-            
-            request_end = time.time()
-            request_time = (request_end - request_start) * 1000
-            
-            if data is not None:
-                successful_requests += 1
-                response_times.append(request_time)
-            
-            # Небольшая задержка между запросами в рамках одного теста
-            time.sleep(0.1)
-        
-        end_time = time.time()
-        end_memory = get_memory_usage()
-        
-        total_time = end_time - start_time
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        rps = successful_requests / total_time if total_time > 0 else 0
-        memory_used = end_memory
-        
-        avg_response_times.append(avg_response_time)
-        rps_list.append(rps)
-        memory_usage_list.append(memory_used)
-        
-        detailed_metrics.append({
-            'requests_count': count,
-            'successful_requests': successful_requests,
-            'avg_response_time_ms': avg_response_time,
-            'rps': rps,
-            'memory_used_mb': memory_used,
-            'total_time_sec': total_time
-        })
-        
-        print(f"Успешных запросов: {successful_requests}/{count}")
-        print(f"Среднее время ответа: {avg_response_time:.2f} мс")
-        print(f"RPS: {rps:.2f} запросов/сек")
-        print(f"Использование памяти: {memory_used:.2f} МБ")
-        print(f"Общее время теста: {total_time:.2f} сек")
-        
-        # Уважаем лимиты API между тестами
-        time.sleep(2)
-    
-    ## График 1: Среднее время ответа
-    plt.figure(figsize=(10, 6))
-    plt.plot(requests_count, avg_response_times, 'bo-', linewidth=2, markersize=8)
-    plt.title('Среднее время ответа API HH.ru')
-    plt.xlabel('Количество страниц')
-    plt.ylabel('Время ответа (мс)')
-    plt.grid(True, alpha=0.3)
-    plt.savefig('graphs/load_testing/response_time.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # График 2: Запросов в секунду (RPS)
-    plt.figure(figsize=(10, 6))
-    plt.plot(requests_count, rps_list, 'go-', linewidth=2, markersize=8)
-    plt.title('Производительность API HH.ru (RPS)')
-    plt.xlabel('Количество страниц')
-    plt.ylabel('Запросов в секунду')
-    plt.grid(True, alpha=0.3)
-    plt.savefig('graphs/load_testing/rps_performance.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # График 3: Использование памяти
-    plt.figure(figsize=(10, 6))
-    plt.plot(requests_count, memory_usage_list, 'ro-', linewidth=2, markersize=8)
-    plt.title('Использование памяти при нагрузочном тестировании')
-    plt.xlabel('Количество страниц')
-    plt.ylabel('Память (МБ)')
-    plt.grid(True, alpha=0.3)
-    plt.savefig('graphs/load_testing/memory_usage.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    df_metrics = pd.DataFrame(detailed_metrics)
     df_metrics.to_csv('load_testing_metrics.csv', index=False, encoding='utf-8-sig')
     print("\nМетрики нагрузочного тестирования сохранены в 'load_testing_metrics.csv'")
     
@@ -165,15 +71,14 @@ def extract_technologies(vacancy_name, vacancy_snippet):
 def exploratory_analysis(filename: str = "programming_vacancies.json"):
     """
     Исследовательский анализ собранных данных с анализом технологий.
-    """
-    with open(filename, 'r', encoding='utf-8') as f:
-        vacancies = json.load(f)
-    
-    print(f"Всего вакансий для анализа: {len(vacancies)}")
     
+    filename - JSON-массив (save_to_json) или NDJSON (файл .ndjson[.gz] или
+    префикс файлов NDJSONSink); NDJSON читается построчно, без загрузки
+    всех вакансий в память.
+    """
     df_data = []
     all_technologies = []
-    for vac in vacancies:
+    for vac in iter_vacancies(filename):
         # Извлекаем зарплату
         salary = vac.get('salary')
         if salary:
@@ -216,6 +121,7 @@ def exploratory_analysis(filename: str = "programming_vacancies.json"):
         })
     
     df = pd.DataFrame(df_data)
+    print(f"Всего вакансий для анализа: {len(df)}")
     
     tech_series = pd.Series(all_technologies)
     tech_counts = tech_series.value_counts()
@@ -353,6 +259,10 @@ def print_detailed_analysis(df, tech_counts):
         print(f"   {emp:<20} {count:>3} вакансий ({percentage:.1f}%)")
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description='Нагрузочное тестирование и анализ вакансий hh.ru')
+    arg_parser.add_argument('--data', default='programming_vacancies.json',
+                            help='Собранные вакансии: JSON или NDJSON (файл или префикс файлов)')
+    args = arg_parser.parse_args()
 
     create_directories()
 
@@ -360,7 +270,7 @@ if __name__ == "__main__":
     load_metrics = load_testing()
     
     print("\n=== ИССЛЕДОВАТЕЛЬСКИЙ АНАЛИЗ ===")
-    df, tech_counts = exploratory_analysis()
+    df, tech_counts = exploratory_analysis(args.data)
     
     print_detailed_analysis(df, tech_counts)
     
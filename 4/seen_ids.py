@@ -0,0 +1,68 @@
+import os
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+
+class SeenIds:
+    """
+    Компактное множество id вакансий, сохраняемое между запусками.
+
+    Id вакансий hh.ru - целые числа, поэтому известные с прошлых запусков id
+    хранятся отсортированным массивом 64-битных чисел (8 байт на вакансию
+    в памяти и на диске) и ищутся бинарным поиском; id текущего запуска
+    накапливаются в обычном множестве и объединяются с массивом при save().
+    Без filename множество живет только в памяти (дедупликация в одном запуске).
+    """
+
+    def __init__(self, filename: Optional[str] = None):
+        self.filename = filename
+        self._known = array('q')
+        self._new = set()
+        if filename and os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                self._known.frombytes(f.read())
+
+    @staticmethod
+    def _key(vacancy_id) -> int:
+        return int(vacancy_id)
+
+    def known_before(self, vacancy_id) -> bool:
+        """Встречался ли id в предыдущих запусках."""
+        key = self._key(vacancy_id)
+        i = bisect_left(self._known, key)
+        return i < len(self._known) and self._known[i] == key
+
+    def __contains__(self, vacancy_id) -> bool:
+        return self._key(vacancy_id) in self._new or self.known_before(vacancy_id)
+
+    @property
+    def has_history(self) -> bool:
+        """Есть ли id с предыдущих запусков."""
+        return len(self._known) > 0
+
+    def __len__(self) -> int:
+        return len(self._known) + len(self._new)
+
+    def add(self, vacancy_id) -> bool:
+        """Добавляет id. Returns: True, если id раньше не встречался."""
+        if vacancy_id in self:
+            return False
+        self._new.add(self._key(vacancy_id))
+        return True
+
+    def update(self, vacancy_ids: Iterable) -> int:
+        """Добавляет несколько id. Returns: количество новых."""
+        return sum(self.add(vacancy_id) for vacancy_id in vacancy_ids)
+
+    def save(self):
+        """Объединяет новые id с сохраненными и атомарно записывает файл."""
+        if self._new:
+            merged = array('q', sorted(set(self._known).union(self._new)))
+            self._known, self._new = merged, set()
+        if not self.filename:
+            return
+        tmp_name = self.filename + '.tmp'
+        with open(tmp_name, 'wb') as f:
+            f.write(self._known.tobytes())
+        os.replace(tmp_name, self.filename)
@@ -0,0 +1,190 @@
+import glob
+import gzip
+import json
+import os
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class NDJSONSink:
+    """
+    Потоковая запись вакансий в NDJSON (одна вакансия - одна строка JSON).
+
+    Каждая страница записывается и сбрасывается на диск сразу после
+    получения, поэтому сбой теряет не больше одной страницы, а память не
+    растет с размером обхода. Файлы ротируются каждые max_records вакансий
+    или max_seconds секунд: текущий файл пишется как
+    '<base>-NNNNN.ndjson[.gz].part' и атомарно переименовывается при
+    ротации и закрытии, так что читатели видят только целые файлы.
+
+    '.part', оставшиеся после сбоя, восстанавливаются при создании sink:
+    целые строки публикуются под постоянным именем, оборванная последняя
+    строка отбрасывается. Нумерация продолжается с наибольшего номера
+    существующих файлов.
+
+    Args:
+        base_path (str): Префикс файлов (напр., 'data/vacancies').
+        compress (bool): Сжимать файлы gzip.
+        max_records (Optional[int]): Вакансий в одном файле до ротации (None - без ограничения).
+        max_seconds (Optional[float]): Время записи одного файла до ротации (None - без ограничения).
+    """
+
+    def __init__(self, base_path: str, compress: bool = False, max_records: Optional[int] = 100000,
+                 max_seconds: Optional[float] = 60.0):
+        self.base_path = base_path
+        self.compress = compress
+        self.max_records = max_records
+        self.max_seconds = max_seconds
+        self.records = 0
+        self.files: List[str] = []
+        self._file = None
+        self._file_records = 0
+        self._opened_at = 0.0
+        directory = os.path.dirname(base_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.recovered = recover_parts(base_path)
+        # Нумерация продолжает файлы предыдущих запусков
+        self._index = max(file_numbers(base_path), default=-1) + 1
+
+    def _current_name(self) -> str:
+        return f"{self.base_path}-{self._index:05d}.ndjson" + ('.gz' if self.compress else '')
+
+    def _open(self):
+        name = self._current_name() + '.part'
+        if self.compress:
+            self._file = gzip.open(name, 'wt', encoding='utf-8')
+        else:
+            self._file = open(name, 'w', encoding='utf-8')
+        self._file_records = 0
+        self._opened_at = time.monotonic()
+
+    def _rotate(self):
+        """Закрывает текущий файл и атомарно публикует его под постоянным именем."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        name = self._current_name()
+        os.replace(name + '.part', name)
+        self.files.append(name)
+        self._index += 1
+
+    def write(self, vacancies: List[Dict[str, Any]]):
+        """Записывает страницу вакансий и сбрасывает ее на диск."""
+        for vacancy in vacancies:
+            if self._file is None:
+                self._open()
+            self._file.write(json.dumps(vacancy, ensure_ascii=False) + '\n')
+            self._file_records += 1
+            self.records += 1
+            if self.max_records and self._file_records >= self.max_records:
+                self._rotate()
+        if self._file is not None:
+            self._file.flush()
+            # Ограничение по времени: при редких страницах данные не лежат долго в .part
+            if self.max_seconds is not None and time.monotonic() - self._opened_at >= self.max_seconds:
+                self._rotate()
+
+    def close(self):
+        """Публикует последний файл."""
+        self._rotate()
+        print(f"Записано вакансий: {self.records} в {len(self.files)} файл(ов) {self.base_path}-*.ndjson")
+
+    def __enter__(self) -> 'NDJSONSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _file_pattern(base_path: str) -> 're.Pattern':
+    return re.compile(re.escape(os.path.basename(base_path)) + r'-(\d+)\.ndjson(\.gz)?(\.part)?$')
+
+
+def file_numbers(base_path: str) -> List[int]:
+    """Номера всех файлов NDJSONSink с данным префиксом, включая незавершенные '.part'."""
+    pattern = _file_pattern(base_path)
+    numbers = []
+    for path in glob.glob(f"{glob.escape(base_path)}-*"):
+        match = pattern.match(os.path.basename(path))
+        if match:
+            numbers.append(int(match.group(1)))
+    return numbers
+
+
+def recover_parts(base_path: str) -> int:
+    """
+    Публикует файлы '.part', оставшиеся после сбоя: целые строки переписываются
+    в файл с постоянным именем, оборванная строка (или поврежденный конец gzip)
+    отбрасывается.
+
+    Returns:
+        int: Количество восстановленных вакансий.
+    """
+    pattern = _file_pattern(base_path)
+    parts = sorted(path for path in glob.glob(f"{glob.escape(base_path)}-*.part")
+                   if pattern.match(os.path.basename(path)))
+    recovered = 0
+    for part in parts:
+        name = part[:-len('.part')]
+        if os.path.exists(name):
+            # Имя уже занято: восстановленный файл получает следующий свободный номер
+            match = pattern.match(os.path.basename(part))
+            number = max(file_numbers(base_path), default=-1) + 1
+            name = f"{base_path}-{number:05d}.ndjson" + (match.group(2) or '')
+
+        opener = gzip.open if name.endswith('.gz') else open
+        tmp_name = name + '.recover'
+        records = 0
+        with opener(tmp_name, 'wt', encoding='utf-8') as out:
+            try:
+                with opener(part, 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.endswith('\n'):
+                            break
+                        out.write(line)
+                        records += 1
+            except (EOFError, OSError, zlib.error, UnicodeDecodeError):
+                # Конец сжатого потока не дописан: все целые строки до него уже сохранены
+                pass
+
+        if records:
+            os.replace(tmp_name, name)
+        else:
+            os.remove(tmp_name)
+        os.remove(part)
+        recovered += records
+        print(f"Восстановлено вакансий из {part}: {records}")
+    return recovered
+
+
+def ndjson_files(base_path: str) -> List[str]:
+    """Завершенные файлы NDJSONSink с данным префиксом по порядку записи."""
+    return sorted(glob.glob(f"{glob.escape(base_path)}-*.ndjson") +
+                  glob.glob(f"{glob.escape(base_path)}-*.ndjson.gz"))
+
+
+def iter_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Построчно читает вакансии из файла NDJSON (.ndjson или .ndjson.gz)
+    или из всех файлов NDJSONSink с префиксом path.
+    """
+    files = [path] if os.path.isfile(path) else ndjson_files(path)
+    for filename in files:
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_vacancies(path: str) -> Iterator[Dict[str, Any]]:
+    """Вакансии из JSON-массива (save_to_json) или из NDJSON (NDJSONSink)."""
+    if os.path.isfile(path) and path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+    else:
+        yield from iter_ndjson(path)